@@ -17,6 +17,9 @@ from .errors import ErrorHandler, ConfigurationError
 
 logger = logging.getLogger(__name__)
 
+# Use the libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 @dataclass
 class DatabricksConfig:
@@ -82,13 +85,53 @@ class ConfigManager:
         Raises:
             ConfigurationError: If configuration is invalid or missing required values
         """
+        file_config = self._load_config_file(config_path)
+        source = f"file {config_path}" if config_path else "default config file"
+        return self._resolve_config(file_config, source)
+    
+    def load_config_from_string(self, yaml_text: str) -> Dict[str, Any]:
+        """
+        Load configuration from YAML text instead of a config file.
+        
+        Environment variables still take precedence over the parsed values.
+        
+        Args:
+            yaml_text: YAML document with the configuration
+            
+        Returns:
+            Dictionary containing merged configuration
+            
+        Raises:
+            ConfigurationError: If the YAML is invalid or the configuration is missing required values
+        """
+        try:
+            file_config = yaml.load(yaml_text, Loader=_YAML_LOADER) or {}
+        except yaml.YAMLError as e:
+            raise ErrorHandler.create_configuration_error(
+                field="config_file",
+                details=f"Failed to parse config: {e}",
+                original_error=e
+            )
+        
+        return self._resolve_config(file_config, 'string')
+    
+    def _resolve_config(self, file_config: Dict[str, Any], source: str) -> Dict[str, Any]:
+        """
+        Apply environment variable overrides to file configuration and validate it.
+        
+        Args:
+            file_config: Configuration parsed from a file or string
+            source: Where file_config came from, e.g. "file <path>" or "string", for logging
+            
+        Returns:
+            Dictionary containing merged configuration
+        """
         config = {}
         
-        # 1. Load from config file (lowest priority)
-        file_config = self._load_config_file(config_path)
+        # 1. Start from file configuration (lowest priority)
         if file_config:
             config.update(file_config)
-            logger.debug(f"Loaded configuration from file: {config_path or 'default location'}")
+            logger.debug(f"Loaded configuration from {source}")
         
         # 2. Override with environment variables (highest priority)
         env_config = self._load_environment_variables()
@@ -123,7 +166,7 @@ class ConfigManager:
                 path = Path(path)
                 if path.exists() and path.is_file():
                     with open(path, 'r', encoding='utf-8') as f:
-                        config = yaml.safe_load(f) or {}
+                        config = yaml.load(f, Loader=_YAML_LOADER) or {}
                     logger.info(f"Loaded configuration from: {path}")
                     return config
             except (yaml.YAMLError, IOError) as e:
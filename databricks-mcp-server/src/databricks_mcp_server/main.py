@@ -11,7 +11,7 @@ import logging
 import os
 import signal
 import sys
-from typing import Optional
+from typing import List, Optional
 
 from .config import ConfigManager, ServerConfig
 from .server import DatabricksMCPServer
@@ -36,12 +36,12 @@ def setup_logging(log_level: str = "INFO") -> None:
     )
 
 
-def parse_arguments() -> argparse.Namespace:
+def build_parser() -> argparse.ArgumentParser:
     """
-    Parse command-line arguments.
+    Build the command-line argument parser.
     
     Returns:
-        Parsed arguments namespace
+        Configured argument parser
     """
     parser = argparse.ArgumentParser(
         description="Databricks MCP Server - Model Context Protocol server for Databricks operations",
@@ -96,7 +96,20 @@ Examples:
         version="databricks-mcp-server 1.0.0"
     )
     
-    return parser.parse_args()
+    return parser
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command-line arguments.
+    
+    Args:
+        argv: Arguments to parse; defaults to sys.argv[1:]
+    
+    Returns:
+        Parsed arguments namespace
+    """
+    return build_parser().parse_args(argv)
 
 
 async def run_server(config: ServerConfig) -> None:
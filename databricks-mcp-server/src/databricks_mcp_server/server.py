@@ -12,16 +12,70 @@ import requests
 from typing import Any, Dict, List, Optional
 from mcp.server import Server
 from mcp.types import Resource, Tool, TextContent
-import mcp.server.stdio
 
 from .errors import (
-    ErrorHandler, ConnectionError, AuthenticationError, WarehouseError,
+    ErrorHandler, MCPServerError, ConnectionError, AuthenticationError, WarehouseError,
     DependencyError, log_structured_error
 )
 
+try:
+    import msgspec
+except ImportError:  # Optional: falls back to response.json()
+    msgspec = None
+
+
+if msgspec is not None:
+    class JobSettings(msgspec.Struct):
+        """Subset of job settings returned by the Jobs API."""
+        name: Optional[str] = None
+        job_type: Optional[str] = None
+        timeout_seconds: Optional[int] = None
+        max_concurrent_runs: Optional[int] = None
+
+    class Job(msgspec.Struct):
+        """Job entry returned by /api/2.1/jobs/list."""
+        job_id: Optional[int] = None
+        settings: JobSettings = msgspec.field(default_factory=JobSettings)
+        creator_user_name: Optional[str] = None
+        created_time: Optional[int] = None
+
+    class JobListResponse(msgspec.Struct):
+        """Response body of /api/2.1/jobs/list."""
+        jobs: List[Job] = []
+
+    class Run(msgspec.Struct):
+        """Response body of /api/2.1/jobs/runs/get."""
+        job_id: Optional[int] = None
+        run_name: Optional[str] = None
+        state: Dict[str, Any] = {}
+        start_time: Optional[int] = None
+        end_time: Optional[int] = None
+        setup_duration: Optional[int] = None
+        execution_duration: Optional[int] = None
+        cleanup_duration: Optional[int] = None
+        creator_user_name: Optional[str] = None
+
 
 logger = logging.getLogger(__name__)
 
+# Maximum run status requests get_job_run_statuses keeps in flight at once
+_MAX_CONCURRENT_RUN_REQUESTS = 8
+
+# Shared JSON schema fragments for the MCP tool definitions
+_CATALOG_PROP = {"type": "string", "description": "Catalog name (optional)"}
+_SCHEMA_PROP = {"type": "string", "description": "Schema name (optional)"}
+_TABLE_NAME_PROP = {"type": "string", "description": "Name of the table"}
+_EMPTY_OBJECT_SCHEMA = {"type": "object", "properties": {}}
+_TABLE_REF_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "table_name": _TABLE_NAME_PROP,
+        "catalog": _CATALOG_PROP,
+        "schema": _SCHEMA_PROP
+    },
+    "required": ["table_name"]
+}
+
 
 class ConnectionManager:
     """Manages Databricks SQL and REST API connections."""
@@ -60,7 +114,7 @@ class ConnectionManager:
             return True
             
         except Exception as e:
-            if hasattr(e, 'category'):  # Already a structured error
+            if isinstance(e, MCPServerError):  # Already a structured error
                 raise
             else:
                 raise ErrorHandler.create_connection_error(
@@ -140,7 +194,7 @@ class ConnectionManager:
             
         except Exception as e:
             # Handle any other exceptions that weren't caught above
-            if hasattr(e, 'category'):  # Already a structured error
+            if isinstance(e, MCPServerError):  # Already a structured error
                 raise
             else:
                 raise ErrorHandler.handle_exception(e, "SQL connection")
@@ -193,7 +247,7 @@ class ConnectionManager:
                 original_error=e
             )
         except Exception as e:
-            if hasattr(e, 'category'):  # Already a structured error
+            if isinstance(e, MCPServerError):  # Already a structured error
                 raise
             else:
                 raise ErrorHandler.create_connection_error(
@@ -266,7 +320,7 @@ class QueryExecutor:
                 error = ErrorHandler.create_warehouse_error(
                     details=f"Warehouse check failed: {warehouse_msg}"
                 )
-                return json.dumps(error.to_dict(), indent=2)
+                return json.dumps(error.to_dict())
             
             connection = self.connection_manager.get_sql_connection()
             cursor = connection.cursor()
@@ -293,7 +347,7 @@ class QueryExecutor:
                     "data": data,
                     "row_count": len(data),
                     "query_type": "SELECT"
-                }, indent=2, default=str)
+                }, default=str)
             else:
                 # For INSERT, UPDATE, DELETE, CREATE, etc.
                 affected_rows = cursor.rowcount if cursor.rowcount >= 0 else 0
@@ -305,16 +359,16 @@ class QueryExecutor:
                     "message": f"Query executed successfully. Affected rows: {affected_rows}",
                     "affected_rows": affected_rows,
                     "query_type": "DML/DDL"
-                }, indent=2)
+                })
                 
         except Exception as e:
-            if hasattr(e, 'category'):  # Already a structured error
+            if isinstance(e, MCPServerError):  # Already a structured error
                 structured_error = e
             else:
                 structured_error = ErrorHandler.handle_exception(e, "query execution")
             
             log_structured_error(structured_error)
-            return json.dumps(structured_error.to_dict(), indent=2)
+            return json.dumps(structured_error.to_dict())
 
 
 class SchemaManager:
@@ -327,13 +381,13 @@ class SchemaManager:
     
     def _handle_error(self, e: Exception, context: str) -> str:
         """Convert exception to structured JSON error response."""
-        if hasattr(e, 'category'):  # Already a structured error
+        if isinstance(e, MCPServerError):  # Already a structured error
             structured_error = e
         else:
             structured_error = ErrorHandler.handle_exception(e, context)
         
         log_structured_error(structured_error)
-        return json.dumps(structured_error.to_dict(), indent=2)
+        return json.dumps(structured_error.to_dict())
 
     async def list_catalogs(self) -> str:
         """List all available catalogs."""
@@ -357,7 +411,7 @@ class SchemaManager:
                 "success": True,
                 "catalogs": catalogs,
                 "count": len(catalogs)
-            }, indent=2)
+            })
             
         except Exception as e:
             return self._handle_error(e, "listing catalogs")
@@ -389,7 +443,7 @@ class SchemaManager:
                 "catalog": catalog,
                 "schemas": schemas,
                 "count": len(schemas)
-            }, indent=2)
+            })
             
         except Exception as e:
             return self._handle_error(e, "listing schemas")
@@ -427,7 +481,7 @@ class SchemaManager:
                 "schema": schema,
                 "tables": tables,
                 "count": len(tables)
-            }, indent=2)
+            })
             
         except Exception as e:
             return self._handle_error(e, "listing tables")
@@ -480,7 +534,7 @@ class SchemaManager:
                 "columns": columns,
                 "table_info": table_info,
                 "column_count": len(columns)
-            }, indent=2)
+            })
             
         except Exception as e:
             return self._handle_error(e, "getting table schema")
@@ -510,7 +564,7 @@ class SchemaManager:
                     "success": True,
                     "table_name": full_table_name,
                     "table_detail": table_detail
-                }, indent=2, default=str)
+                }, default=str)
             else:
                 cursor.close()
                 connection.close()
@@ -518,7 +572,7 @@ class SchemaManager:
                 return json.dumps({
                     "success": False,
                     "error": f"Table {full_table_name} not found or no details available"
-                }, indent=2)
+                })
             
         except Exception as e:
             return self._handle_error(e, "describing table")
@@ -534,13 +588,13 @@ class TableManager:
     
     def _handle_error(self, e: Exception, context: str) -> str:
         """Convert exception to structured JSON error response."""
-        if hasattr(e, 'category'):  # Already a structured error
+        if isinstance(e, MCPServerError):  # Already a structured error
             structured_error = e
         else:
             structured_error = ErrorHandler.handle_exception(e, context)
         
         log_structured_error(structured_error)
-        return json.dumps(structured_error.to_dict(), indent=2)
+        return json.dumps(structured_error.to_dict())
 
     async def create_table(self, table_name: str, columns: List[str], catalog: Optional[str] = None, schema: Optional[str] = None) -> str:
         """Create a new table in Databricks."""
@@ -563,7 +617,7 @@ class TableManager:
                 "message": f"Table '{full_table_name}' created successfully",
                 "table_name": full_table_name,
                 "sql": create_sql
-            }, indent=2)
+            })
             
         except Exception as e:
             return self._handle_error(e, "creating table")
@@ -575,7 +629,7 @@ class TableManager:
                 return json.dumps({
                     "success": False,
                     "error": "No data provided for insertion"
-                }, indent=2)
+                })
             
             connection = self.connection_manager.get_sql_connection()
             cursor = connection.cursor()
@@ -608,7 +662,7 @@ class TableManager:
                 "message": f"Inserted {rows_inserted} rows into '{full_table_name}'",
                 "table_name": full_table_name,
                 "rows_inserted": rows_inserted
-            }, indent=2)
+            })
             
         except Exception as e:
             return self._handle_error(e, "inserting data")
@@ -620,16 +674,81 @@ class ClusterManager:
     def __init__(self, connection_manager: ConnectionManager):
         """Initialize cluster manager with connection manager."""
         self.connection_manager = connection_manager
+        self._base_url: Optional[str] = None
+    
+    def _cache_job_urls(self, base_url: str) -> None:
+        """Precompute the Jobs API URLs, rebuilding them if the base URL changes."""
+        if base_url != self._base_url:
+            self._base_url = base_url
+            self._url_jobs_list = f"{base_url}/api/2.1/jobs/list"
+            self._url_run_now = f"{base_url}/api/2.1/jobs/run-now"
+            self._url_runs_get = f"{base_url}/api/2.1/jobs/runs/get"
     
     def _handle_error(self, e: Exception, context: str) -> str:
         """Convert exception to structured JSON error response."""
-        if hasattr(e, 'category'):  # Already a structured error
+        if isinstance(e, MCPServerError):  # Already a structured error
             structured_error = e
         else:
             structured_error = ErrorHandler.handle_exception(e, context)
         
         log_structured_error(structured_error)
-        return json.dumps(structured_error.to_dict(), indent=2)
+        return json.dumps(structured_error.to_dict())
+
+    def _format_http_error(self, response: requests.Response, context: str) -> str:
+        """Convert a non-2xx REST response to a structured JSON error without raising."""
+        structured_error = self._http_error(response, context)
+        log_structured_error(structured_error)
+        return json.dumps(structured_error.to_dict())
+
+    def _http_error(self, response: requests.Response, context: str) -> MCPServerError:
+        """Build the structured error for a non-2xx REST response."""
+        details = f"API request failed while {context} with status {response.status_code}: {response.text[:512]}"
+        if response.status_code == 401:
+            structured_error = ErrorHandler.create_authentication_error(details=details)
+        elif response.status_code == 403:
+            structured_error = ErrorHandler.create_authentication_error(
+                details=details,
+                insufficient_permissions=True
+            )
+        else:
+            structured_error = ErrorHandler.create_connection_error(details=details)
+        
+        return structured_error
+
+    def _parse_run_info(self, response: requests.Response) -> Dict[str, Any]:
+        """Extract the run fields reported by the job run status tools."""
+        if msgspec is not None:
+            run = msgspec.json.decode(response.content, type=Run)
+            return {
+                "job_id": run.job_id,
+                "run_name": run.run_name,
+                "state": run.state,
+                "life_cycle_state": run.state.get("life_cycle_state"),
+                "result_state": run.state.get("result_state"),
+                "state_message": run.state.get("state_message"),
+                "start_time": run.start_time,
+                "end_time": run.end_time,
+                "setup_duration": run.setup_duration,
+                "execution_duration": run.execution_duration,
+                "cleanup_duration": run.cleanup_duration,
+                "creator_user_name": run.creator_user_name
+            }
+        
+        run_data = response.json()
+        return {
+            "job_id": run_data.get("job_id"),
+            "run_name": run_data.get("run_name"),
+            "state": run_data.get("state"),
+            "life_cycle_state": run_data.get("state", {}).get("life_cycle_state"),
+            "result_state": run_data.get("state", {}).get("result_state"),
+            "state_message": run_data.get("state", {}).get("state_message"),
+            "start_time": run_data.get("start_time"),
+            "end_time": run_data.get("end_time"),
+            "setup_duration": run_data.get("setup_duration"),
+            "execution_duration": run_data.get("execution_duration"),
+            "cleanup_duration": run_data.get("cleanup_duration"),
+            "creator_user_name": run_data.get("creator_user_name")
+        }
 
     async def list_clusters(self) -> str:
         """List available Databricks compute clusters."""
@@ -660,7 +779,7 @@ class ClusterManager:
                 "success": True,
                 "clusters": cluster_info,
                 "count": len(cluster_info)
-            }, indent=2)
+            })
             
         except Exception as e:
             return self._handle_error(e, "listing clusters")
@@ -691,7 +810,7 @@ class ClusterManager:
                     "terminated_time": cluster_data.get("terminated_time"),
                     "last_state_loss_time": cluster_data.get("last_state_loss_time")
                 }
-            }, indent=2, default=str)
+            }, default=str)
             
         except Exception as e:
             return self._handle_error(e, "getting cluster status")
@@ -699,32 +818,47 @@ class ClusterManager:
     async def list_jobs(self) -> str:
         """List available Databricks jobs."""
         try:
-            session, base_url = self.connection_manager.get_rest_client()
+            # get_rest_client probes the API, so it runs off the event loop too
+            session, base_url = await asyncio.to_thread(self.connection_manager.get_rest_client)
+            self._cache_job_urls(base_url)
             
-            response = session.get(f"{base_url}/api/2.1/jobs/list")
-            response.raise_for_status()
-            
-            data = response.json()
-            jobs = data.get('jobs', [])
+            response = await asyncio.to_thread(session.get, self._url_jobs_list)
+            if not response.ok:
+                return self._format_http_error(response, "listing jobs")
             
             # Format job information
             job_info = []
-            for job in jobs:
-                job_info.append({
-                    "job_id": job.get("job_id"),
-                    "job_name": job.get("settings", {}).get("name"),
-                    "job_type": job.get("settings", {}).get("job_type"),
-                    "creator_user_name": job.get("creator_user_name"),
-                    "created_time": job.get("created_time"),
-                    "timeout_seconds": job.get("settings", {}).get("timeout_seconds"),
-                    "max_concurrent_runs": job.get("settings", {}).get("max_concurrent_runs")
-                })
+            if msgspec is not None:
+                data = msgspec.json.decode(response.content, type=JobListResponse)
+                for job in data.jobs:
+                    job_info.append({
+                        "job_id": job.job_id,
+                        "job_name": job.settings.name,
+                        "job_type": job.settings.job_type,
+                        "creator_user_name": job.creator_user_name,
+                        "created_time": job.created_time,
+                        "timeout_seconds": job.settings.timeout_seconds,
+                        "max_concurrent_runs": job.settings.max_concurrent_runs
+                    })
+            else:
+                data = response.json()
+                for job in data.get('jobs', []):
+                    settings = job.get("settings", {})
+                    job_info.append({
+                        "job_id": job.get("job_id"),
+                        "job_name": settings.get("name"),
+                        "job_type": settings.get("job_type"),
+                        "creator_user_name": job.get("creator_user_name"),
+                        "created_time": job.get("created_time"),
+                        "timeout_seconds": settings.get("timeout_seconds"),
+                        "max_concurrent_runs": settings.get("max_concurrent_runs")
+                    })
             
             return json.dumps({
                 "success": True,
                 "jobs": job_info,
                 "count": len(job_info)
-            }, indent=2, default=str)
+            }, default=str)
             
         except Exception as e:
             return self._handle_error(e, "listing jobs")
@@ -732,11 +866,13 @@ class ClusterManager:
     async def run_job(self, job_id: str) -> str:
         """Trigger execution of a Databricks job."""
         try:
-            session, base_url = self.connection_manager.get_rest_client()
+            session, base_url = await asyncio.to_thread(self.connection_manager.get_rest_client)
+            self._cache_job_urls(base_url)
             
             payload = {"job_id": int(job_id)}
-            response = session.post(f"{base_url}/api/2.1/jobs/run-now", json=payload)
-            response.raise_for_status()
+            response = await asyncio.to_thread(session.post, self._url_run_now, json=payload)
+            if not response.ok:
+                return self._format_http_error(response, "running job")
             
             data = response.json()
             run_id = data.get("run_id")
@@ -746,7 +882,7 @@ class ClusterManager:
                 "message": f"Job {job_id} triggered successfully",
                 "job_id": job_id,
                 "run_id": run_id
-            }, indent=2)
+            })
             
         except Exception as e:
             return self._handle_error(e, "running job")
@@ -754,35 +890,74 @@ class ClusterManager:
     async def get_job_run_status(self, run_id: str) -> str:
         """Get status of a job run."""
         try:
-            session, base_url = self.connection_manager.get_rest_client()
+            session, base_url = await asyncio.to_thread(self.connection_manager.get_rest_client)
+            self._cache_job_urls(base_url)
             
-            response = session.get(f"{base_url}/api/2.1/jobs/runs/get", params={"run_id": run_id})
-            response.raise_for_status()
-            
-            run_data = response.json()
+            response = await asyncio.to_thread(session.get, self._url_runs_get, params={"run_id": run_id})
+            if not response.ok:
+                return self._format_http_error(response, "getting job run status")
             
             return json.dumps({
                 "success": True,
                 "run_id": run_id,
-                "run_info": {
-                    "job_id": run_data.get("job_id"),
-                    "run_name": run_data.get("run_name"),
-                    "state": run_data.get("state"),
-                    "life_cycle_state": run_data.get("state", {}).get("life_cycle_state"),
-                    "result_state": run_data.get("state", {}).get("result_state"),
-                    "state_message": run_data.get("state", {}).get("state_message"),
-                    "start_time": run_data.get("start_time"),
-                    "end_time": run_data.get("end_time"),
-                    "setup_duration": run_data.get("setup_duration"),
-                    "execution_duration": run_data.get("execution_duration"),
-                    "cleanup_duration": run_data.get("cleanup_duration"),
-                    "creator_user_name": run_data.get("creator_user_name")
-                }
-            }, indent=2, default=str)
+                "run_info": self._parse_run_info(response)
+            }, default=str)
             
         except Exception as e:
             return self._handle_error(e, "getting job run status")
 
+    async def get_job_run_statuses(self, run_ids: List[str]) -> str:
+        """Get status of several job runs, issuing the requests concurrently."""
+        try:
+            session, base_url = await asyncio.to_thread(self.connection_manager.get_rest_client)
+            self._cache_job_urls(base_url)
+            
+            # Bound the fan-out: the requests share one Session across worker threads
+            limit = asyncio.Semaphore(_MAX_CONCURRENT_RUN_REQUESTS)
+            
+            async def fetch(run_id: str):
+                # A transport failure is returned, not raised, so it only fails this run
+                async with limit:
+                    try:
+                        return await asyncio.to_thread(
+                            session.get, self._url_runs_get, params={"run_id": run_id}
+                        )
+                    except requests.RequestException as e:
+                        return e
+            
+            responses = await asyncio.gather(*(fetch(run_id) for run_id in run_ids))
+            
+            runs = []
+            for run_id, response in zip(run_ids, responses):
+                context = f"getting status of run {run_id}"
+                if isinstance(response, requests.RequestException):
+                    structured_error = ErrorHandler.handle_exception(response, context)
+                elif response.ok:
+                    runs.append({
+                        "success": True,
+                        "run_id": run_id,
+                        "run_info": self._parse_run_info(response)
+                    })
+                    continue
+                else:
+                    structured_error = self._http_error(response, context)
+                
+                log_structured_error(structured_error)
+                runs.append({
+                    "success": False,
+                    "run_id": run_id,
+                    "error": structured_error.to_dict()
+                })
+            
+            return json.dumps({
+                "success": all(run["success"] for run in runs),
+                "runs": runs,
+                "count": len(runs)
+            }, default=str)
+            
+        except Exception as e:
+            return self._handle_error(e, "getting job run statuses")
+
 
 class DatabricksMCPServer:
     """
@@ -816,13 +991,13 @@ class DatabricksMCPServer:
     
     def _handle_error(self, e: Exception, context: str) -> str:
         """Convert exception to structured JSON error response."""
-        if hasattr(e, 'category'):  # Already a structured error
+        if isinstance(e, MCPServerError):  # Already a structured error
             structured_error = e
         else:
             structured_error = ErrorHandler.handle_exception(e, context)
         
         log_structured_error(structured_error)
-        return json.dumps(structured_error.to_dict(), indent=2)
+        return json.dumps(structured_error.to_dict())
         
     def _register_handlers(self):
         """Register MCP server handlers."""
@@ -845,10 +1020,7 @@ class DatabricksMCPServer:
                 Tool(
                     name="list_catalogs",
                     description="List all available catalogs in Databricks",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {}
-                    }
+                    inputSchema=_EMPTY_OBJECT_SCHEMA
                 ),
                 Tool(
                     name="list_schemas",
@@ -866,36 +1038,20 @@ class DatabricksMCPServer:
                     inputSchema={
                         "type": "object",
                         "properties": {
-                            "catalog": {"type": "string", "description": "Catalog name (optional)"},
-                            "schema": {"type": "string", "description": "Schema name (optional)"}
+                            "catalog": _CATALOG_PROP,
+                            "schema": _SCHEMA_PROP
                         }
                     }
                 ),
                 Tool(
                     name="get_table_schema",
                     description="Get detailed schema information for a table",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "table_name": {"type": "string", "description": "Name of the table"},
-                            "catalog": {"type": "string", "description": "Catalog name (optional)"},
-                            "schema": {"type": "string", "description": "Schema name (optional)"}
-                        },
-                        "required": ["table_name"]
-                    }
+                    inputSchema=_TABLE_REF_SCHEMA
                 ),
                 Tool(
                     name="describe_table",
                     description="Get comprehensive table metadata including location and format",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "table_name": {"type": "string", "description": "Name of the table"},
-                            "catalog": {"type": "string", "description": "Catalog name (optional)"},
-                            "schema": {"type": "string", "description": "Schema name (optional)"}
-                        },
-                        "required": ["table_name"]
-                    }
+                    inputSchema=_TABLE_REF_SCHEMA
                 ),
                 Tool(
                     name="create_table",
@@ -905,8 +1061,8 @@ class DatabricksMCPServer:
                         "properties": {
                             "table_name": {"type": "string", "description": "Name of the table to create"},
                             "columns": {"type": "array", "description": "Column definitions", "items": {"type": "string"}},
-                            "catalog": {"type": "string", "description": "Catalog name (optional)"},
-                            "schema": {"type": "string", "description": "Schema name (optional)"}
+                            "catalog": _CATALOG_PROP,
+                            "schema": _SCHEMA_PROP
                         },
                         "required": ["table_name", "columns"]
                     }
@@ -917,7 +1073,7 @@ class DatabricksMCPServer:
                     inputSchema={
                         "type": "object",
                         "properties": {
-                            "table_name": {"type": "string", "description": "Name of the table"},
+                            "table_name": _TABLE_NAME_PROP,
                             "data": {
                                 "type": "array", 
                                 "description": "Array of row objects to insert",
@@ -926,8 +1082,8 @@ class DatabricksMCPServer:
                                     "description": "Row data as key-value pairs"
                                 }
                             },
-                            "catalog": {"type": "string", "description": "Catalog name (optional)"},
-                            "schema": {"type": "string", "description": "Schema name (optional)"}
+                            "catalog": _CATALOG_PROP,
+                            "schema": _SCHEMA_PROP
                         },
                         "required": ["table_name", "data"]
                     }
@@ -935,10 +1091,7 @@ class DatabricksMCPServer:
                 Tool(
                     name="list_clusters",
                     description="List available Databricks compute clusters",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {}
-                    }
+                    inputSchema=_EMPTY_OBJECT_SCHEMA
                 ),
                 Tool(
                     name="get_cluster_status",
@@ -954,10 +1107,7 @@ class DatabricksMCPServer:
                 Tool(
                     name="list_jobs",
                     description="List available Databricks jobs",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {}
-                    }
+                    inputSchema=_EMPTY_OBJECT_SCHEMA
                 ),
                 Tool(
                     name="run_job",
@@ -982,20 +1132,25 @@ class DatabricksMCPServer:
                     }
                 ),
                 Tool(
-                    name="check_warehouse_status",
-                    description="Check the status of the serverless warehouse and start it if needed",
+                    name="get_job_run_statuses",
+                    description="Get status of several job runs in one call",
                     inputSchema={
                         "type": "object",
-                        "properties": {}
+                        "properties": {
+                            "run_ids": {"type": "array", "description": "IDs of the job runs", "items": {"type": "string"}}
+                        },
+                        "required": ["run_ids"]
                     }
                 ),
+                Tool(
+                    name="check_warehouse_status",
+                    description="Check the status of the serverless warehouse and start it if needed",
+                    inputSchema=_EMPTY_OBJECT_SCHEMA
+                ),
                 Tool(
                     name="ping",
                     description="Simple ping test to check if the MCP server is responsive",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {}
-                    }
+                    inputSchema=_EMPTY_OBJECT_SCHEMA
                 )
             ]
 
@@ -1050,6 +1205,8 @@ class DatabricksMCPServer:
                     result = await self.cluster_manager.run_job(arguments["job_id"])
                 elif name == "get_job_run_status":
                     result = await self.cluster_manager.get_job_run_status(arguments["run_id"])
+                elif name == "get_job_run_statuses":
+                    result = await self.cluster_manager.get_job_run_statuses(arguments["run_ids"])
                 elif name == "check_warehouse_status":
                     result = await self._check_warehouse_status_tool()
                 elif name == "ping":
@@ -1060,13 +1217,13 @@ class DatabricksMCPServer:
                 return [TextContent(type="text", text=result)]
                 
             except Exception as e:
-                if hasattr(e, 'category'):  # Already a structured error
+                if isinstance(e, MCPServerError):  # Already a structured error
                     structured_error = e
                 else:
                     structured_error = ErrorHandler.handle_exception(e, f"executing tool {name}")
                 
                 log_structured_error(structured_error)
-                error_response = json.dumps(structured_error.to_dict(), indent=2)
+                error_response = json.dumps(structured_error.to_dict())
                 return [TextContent(type="text", text=error_response)]
 
     async def _check_warehouse_status_tool(self) -> str:
@@ -1077,7 +1234,7 @@ class DatabricksMCPServer:
                 "success": warehouse_ok,
                 "message": warehouse_msg,
                 "status": "running" if warehouse_ok else "error"
-            }, indent=2)
+            })
         except Exception as e:
             return self._handle_error(e, "checking warehouse status")
 
@@ -1095,12 +1252,15 @@ class DatabricksMCPServer:
                 "message": "Pong! MCP server is responsive",
                 "response_time_ms": response_time,
                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
-            }, indent=2)
+            })
         except Exception as e:
             return self._handle_error(e, "ping test")
         
     async def start(self) -> None:
         """Start the MCP server."""
+        # Imported here so the server can be built without the stdio transport
+        import mcp.server.stdio
+        
         try:
             # Run the server
             async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
@@ -8,11 +8,42 @@ operating systems and environments, simulating uvx isolation.
 
 import os
 import sys
+import time
+import codecs
+import hashlib
+import importlib.util
+import shutil
+import selectors
 import subprocess
 import platform
 import tempfile
 import argparse
+import logging
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache, partial
 from pathlib import Path
+from venv import EnvBuilder
+
+
+logger = logging.getLogger(__name__)
+
+# Prefer uv for venv creation and installs when it is available
+HAS_UV = shutil.which("uv") is not None
+
+# Layout of virtual environment executables on this platform
+VENV_BIN = "Scripts" if sys.platform == "win32" else "bin"
+EXE_SUFFIX = ".exe" if sys.platform == "win32" else ""
+
+# Summary labels keyed by test outcome
+STATUS_LABELS = {True: "✅ PASSED", False: "❌ FAILED"}
+
+
+@lru_cache(maxsize=None)
+def platform_label():
+    """Return the "<system> <release>" label used in the summary, probing the platform once."""
+    return f"{platform.system()} {platform.release()}"
 
 
 def print_platform_info():
@@ -38,155 +69,320 @@ def print_platform_info():
     print()
 
 
-def run_command(cmd, description, timeout=60, env=None):
-    """Run a command and return the result."""
-    print(f"\n{'='*60}")
-    print(f"Running: {description}")
-    print(f"Command: {' '.join(str(c) for c in cmd)}")
-    print(f"{'='*60}")
+def configure_logging(level):
+    """Send runner log records to stdout as plain messages."""
+    logging.basicConfig(level=level, format="%(message)s", stream=sys.stdout)
+
+
+def stream_output(process, timeout, echo=True, text=True):
+    """Collect a process's stdout/stderr, echoing it as it arrives when echo is set.
+    
+    Output is only decoded when text is set (or for echoing). Returns
+    (stdout, stderr, timed_out).
+    """
+    if sys.platform == "win32":
+        # selectors can't wait on pipes on Windows; fall back to communicate()
+        timed_out = False
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            stdout, stderr = process.communicate()
+            timed_out = True
+        if echo and not timed_out:
+            sys.stdout.write((stdout + stderr).decode(errors="replace"))
+    else:
+        chunks = {process.stdout: [], process.stderr: []}
+        decoders = {pipe: codecs.getincrementaldecoder("utf-8")(errors="replace") for pipe in chunks}
+        deadline = time.monotonic() + timeout
+        timed_out = False
+        
+        with selectors.DefaultSelector() as selector:
+            for pipe in chunks:
+                selector.register(pipe, selectors.EVENT_READ)
+            
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    timed_out = True
+                    break
+                for key, _ in selector.select(remaining):
+                    data = os.read(key.fileobj.fileno(), 65536)
+                    if not data:
+                        selector.unregister(key.fileobj)
+                        continue
+                    chunks[key.fileobj].append(data)
+                    if echo:
+                        sys.stdout.write(decoders[key.fileobj].decode(data))
+                        sys.stdout.flush()
+        
+        if timed_out:
+            process.kill()
+        
+        # Drain anything left in the pipes and reap the process
+        stdout, stderr = process.communicate()
+        stdout = b"".join(chunks[process.stdout]) + stdout
+        stderr = b"".join(chunks[process.stderr]) + stderr
+    
+    if text:
+        stdout, stderr = stdout.decode(errors="replace"), stderr.decode(errors="replace")
+    return stdout, stderr, timed_out
+
+
+def run_command(cmd, description, timeout=60, env=None, text=True):
+    """Run a command and return the result.
+    
+    Output is streamed at DEBUG level (--verbose) and dumped on failure otherwise.
+    Pass text=False when only the return code matters to skip decoding the output.
+    """
+    logger.info("Running: %s", description)
+    verbose = logger.isEnabledFor(logging.DEBUG)
+    if verbose:
+        logger.debug("Command: %s", " ".join(str(c) for c in cmd))
     
     try:
-        result = subprocess.run(
-            cmd, 
-            capture_output=True, 
-            text=True, 
-            timeout=timeout,
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             env=env
         )
-        
-        if result.stdout:
-            print("STDOUT:")
-            print(result.stdout)
-        
-        if result.stderr:
-            print("STDERR:")
-            print(result.stderr)
-        
-        print(f"Return code: {result.returncode}")
-        return result
-    
-    except subprocess.TimeoutExpired:
-        print(f"❌ Command timed out after {timeout} seconds")
-        return None
+        stdout, stderr, timed_out = stream_output(process, timeout, echo=verbose, text=text)
     except Exception as e:
-        print(f"❌ Error running command: {e}")
+        logger.error("❌ Error running command: %s", e)
         return None
+    
+    if timed_out:
+        logger.error("❌ Command timed out after %s seconds", timeout)
+        return None
+    
+    if process.returncode != 0 and not verbose:
+        if not text:
+            stdout, stderr = stdout.decode(errors="replace"), stderr.decode(errors="replace")
+        logger.warning("Command failed: %s\nSTDOUT:\n%s\nSTDERR:\n%s",
+                       " ".join(str(c) for c in cmd), stdout, stderr)
+    logger.debug("Return code: %s", process.returncode)
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
 
 
-def test_package_installation():
-    """Test package installation in isolated environment."""
-    print("\n" + "="*80)
-    print("TESTING PACKAGE INSTALLATION")
-    print("="*80)
-    
-    with tempfile.TemporaryDirectory() as temp_dir:
-        venv_path = Path(temp_dir) / "cross_platform_test_venv"
-        
-        # Create virtual environment
+def venv_python(venv_path):
+    """Return the python executable of a virtual environment."""
+    return venv_path / VENV_BIN / f"python{EXE_SUFFIX}"
+
+
+def make_venv_and_install(venv_path):
+    """Create a venv at venv_path and install the package into it.
+    
+    Uses uv when it is on PATH, otherwise the stdlib venv module and pip. An
+    existing venv is reused, and the install is skipped if it is still current.
+    """
+    python_exe = venv_python(venv_path)
+    if python_exe.exists():
+        if not _needs_install(venv_path):
+            logger.info("Reusing editable install in %s", venv_path)
+            return True
+    elif HAS_UV:
         result = run_command([
-            sys.executable, "-m", "venv", str(venv_path)
-        ], "Create isolated virtual environment")
+            "uv", "venv", str(venv_path)
+        ], "Create virtual environment with uv", text=False)
         
         if not result or result.returncode != 0:
             print("❌ Failed to create virtual environment")
             return False
-        
-        # Get platform-specific paths
-        if sys.platform == "win32":
-            pip_exe = venv_path / "Scripts" / "pip.exe"
-            python_exe = venv_path / "Scripts" / "python.exe"
-        else:
-            pip_exe = venv_path / "bin" / "pip"
-            python_exe = venv_path / "bin" / "python"
-        
-        # Upgrade pip
-        result = run_command([
-            str(pip_exe), "install", "--upgrade", "pip"
-        ], "Upgrade pip in isolated environment")
-        
-        if not result or result.returncode != 0:
-            print("⚠️  Warning: Failed to upgrade pip")
-        
-        # Install package
-        result = run_command([
-            str(pip_exe), "install", "-e", "."
-        ], "Install package in isolated environment")
-        
-        if not result or result.returncode != 0:
-            print("❌ Failed to install package")
-            return False
-        
-        # Test basic import
-        result = run_command([
-            str(python_exe), "-c", 
-            "import databricks_mcp_server; print('Package import successful')"
-        ], "Test package import")
-        
-        if not result or result.returncode != 0:
-            print("❌ Failed to import package")
-            return False
-        
-        if "Package import successful" not in result.stdout:
-            print("❌ Package import message not found")
+    else:
+        # Create virtual environment in-process rather than via `python -m venv`.
+        # Skipping ensurepip avoids bootstrapping a second pip into the venv.
+        try:
+            EnvBuilder(with_pip=False, clear=True, symlinks=(sys.platform != "win32")).create(str(venv_path))
+        except Exception as e:
+            print(f"❌ Failed to create virtual environment: {e}")
             return False
-        
-        # Test entry point
+    
+    if HAS_UV:
         result = run_command([
-            str(python_exe), "-m", "databricks_mcp_server.main", "--help"
-        ], "Test entry point execution")
-        
-        if not result or result.returncode != 0:
-            print("❌ Failed to execute entry point")
-            return False
-        
-        # Test version command
+            "uv", "pip", "install", "--python", str(python_exe), "-e", "."
+        ], "Install package with uv", timeout=300, text=False)
+    else:
+        # Install package with the host pip targeting the venv (pip >= 22.3)
         result = run_command([
-            str(python_exe), "-m", "databricks_mcp_server.main", "--version"
-        ], "Test version command")
+            sys.executable, "-m", "pip", "--python", str(python_exe),
+            "install", "--disable-pip-version-check", "--no-cache-dir", "-e", "."
+        ], "Install package in shared environment", timeout=300, text=False)
+    
+    if not result or result.returncode != 0:
+        print("❌ Failed to install package")
+        return False
+    
+    return True
+
+
+def _needs_install(venv_path):
+    """Return whether the venv lacks an editable install of this package newer than pyproject.toml."""
+    lib_dir = venv_path / ("Lib" if sys.platform == "win32" else "lib")
+    site_dirs = [lib_dir / "site-packages"] if sys.platform == "win32" else [
+        Path(entry.path) / "site-packages" for entry in os.scandir(lib_dir) if entry.is_dir()
+    ]
+    source_dir = str(Path("src").resolve())
+    pyproject_mtime = Path("pyproject.toml").stat().st_mtime
+    
+    for site_dir in site_dirs:
+        if not site_dir.is_dir():
+            continue
+        for entry in os.scandir(site_dir):
+            if "databricks_mcp_server" not in entry.name or not entry.name.endswith((".pth", ".egg-link")):
+                continue
+            if entry.stat().st_mtime >= pyproject_mtime and source_dir in Path(entry.path).read_text():
+                return False
+    return True
+
+
+def user_cache_dir():
+    """Return the per-user cache directory used by this runner."""
+    if sys.platform == "win32":
+        cache_root = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    else:
+        cache_root = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return cache_root / "databricks-mcp-server"
+
+
+def wheel_cache_dir():
+    """Return the per-user cache directory for built wheels, keyed on the package sources."""
+    digest = hashlib.sha256(Path("pyproject.toml").read_bytes())
+    for source in sorted(Path("src").rglob("*.py")):
+        digest.update(source.read_bytes())
+    return user_cache_dir() / "wheels" / digest.hexdigest()[:16]
+
+
+def build_cached_wheel():
+    """Build the package wheel once into the user cache and return its path, or None."""
+    wheel_dir = wheel_cache_dir()
+    wheels = sorted(wheel_dir.glob("databricks_mcp_server-*.whl"))
+    if wheels:
+        logger.info("Reusing cached wheel: %s", wheels[-1])
+        return wheels[-1]
+    
+    wheel_dir.mkdir(parents=True, exist_ok=True)
+    if HAS_UV:
+        cmd = ["uv", "build", "--wheel", "--out-dir", str(wheel_dir)]
+    else:
+        cmd = [sys.executable, "-m", "pip", "wheel", "--disable-pip-version-check",
+               "--no-deps", "--wheel-dir", str(wheel_dir), "."]
+    result = run_command(cmd, "Build package wheel", timeout=300, text=False)
+    if not result or result.returncode != 0:
+        return None
+    
+    wheels = sorted(wheel_dir.glob("databricks_mcp_server-*.whl"))
+    return wheels[-1] if wheels else None
+
+
+@contextmanager
+def scratch_dir(root, name):
+    """Yield a fresh working directory under the suite root.
+    
+    Falls back to a private temporary directory when a test runs standalone.
+    """
+    if root is None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield Path(temp_dir)
+        return
+    
+    path = Path(root) / f"{name}_{uuid.uuid4().hex[:8]}"
+    path.mkdir()
+    yield path
+
+
+@contextmanager
+def shared_venv(root=None, reuse=False):
+    """Create one venv with the package installed and yield its python executable.
+    
+    The venv has no pip of its own; installs go through uv or the host's
+    pip --python. With reuse, the venv lives in the user cache and persists
+    across runs. Yields None if the environment could not be set up.
+    """
+    with ExitStack() as stack:
+        if reuse:
+            venv_path = user_cache_dir() / "venv"
+        else:
+            venv_path = stack.enter_context(scratch_dir(root, "shared_venv")) / "venv"
+        if not make_venv_and_install(venv_path):
+            yield None
+            return
         
-        if not result or result.returncode != 0:
-            print("❌ Failed to execute version command")
+        yield venv_python(venv_path)
+
+
+def run_in_shared_venv(test_func):
+    """Run a venv-based test on its own by creating the shared venv for it."""
+    with shared_venv() as python_exe:
+        if python_exe is None:
+            print("❌ Failed to set up isolated environment")
             return False
-        
-        print("✅ Package installation test passed")
-        return True
+        return test_func(python_exe)
 
 
-def test_configuration_handling():
+def venv_unavailable(*_):
+    """Stand-in result for venv-based tests when the shared venv failed to build."""
+    return False
+
+
+def test_package_installation(python_exe=None):
+    """Test package installation in isolated environment."""
+    if python_exe is None:
+        return run_in_shared_venv(test_package_installation)
+    
+    print("\n" + "="*80)
+    print("TESTING PACKAGE INSTALLATION")
+    print("="*80)
+    
+    # Test basic import
+    result = run_command([
+        str(python_exe), "-c", 
+        "import databricks_mcp_server; print('Package import successful')"
+    ], "Test package import")
+    
+    if not result or result.returncode != 0:
+        print("❌ Failed to import package")
+        return False
+    
+    if "Package import successful" not in result.stdout:
+        print("❌ Package import message not found")
+        return False
+    
+    # Test entry point
+    result = run_command([
+        str(python_exe), "-m", "databricks_mcp_server.main", "--help"
+    ], "Test entry point execution", text=False)
+    
+    if not result or result.returncode != 0:
+        print("❌ Failed to execute entry point")
+        return False
+    
+    # Test version command
+    result = run_command([
+        str(python_exe), "-m", "databricks_mcp_server.main", "--version"
+    ], "Test version command", text=False)
+    
+    if not result or result.returncode != 0:
+        print("❌ Failed to execute version command")
+        return False
+    
+    print("✅ Package installation test passed")
+    return True
+
+
+def test_configuration_handling(python_exe=None, root=None):
     """Test configuration file and environment variable handling."""
+    if python_exe is None:
+        return run_in_shared_venv(test_configuration_handling)
+    
     print("\n" + "="*80)
     print("TESTING CONFIGURATION HANDLING")
     print("="*80)
     
-    with tempfile.TemporaryDirectory() as temp_dir:
-        venv_path = Path(temp_dir) / "config_test_venv"
-        config_dir = Path(temp_dir) / "config"
+    with scratch_dir(root, "configuration") as work_dir:
+        config_dir = work_dir / "config"
         config_dir.mkdir()
         
-        # Create virtual environment
-        result = run_command([
-            sys.executable, "-m", "venv", str(venv_path)
-        ], "Create virtual environment for config test")
-        
-        if not result or result.returncode != 0:
-            return False
-        
-        # Get platform-specific paths
-        if sys.platform == "win32":
-            pip_exe = venv_path / "Scripts" / "pip.exe"
-            python_exe = venv_path / "Scripts" / "python.exe"
-        else:
-            pip_exe = venv_path / "bin" / "pip"
-            python_exe = venv_path / "bin" / "python"
-        
-        # Install package
-        result = run_command([
-            str(pip_exe), "install", "-e", "."
-        ], "Install package for config test")
-        
-        if not result or result.returncode != 0:
-            return False
-        
         # Test 1: Configuration file
         config_file = config_dir / "test_config.yaml"
         config_content = """
@@ -195,8 +391,7 @@ databricks:
   http_path: /sql/1.0/warehouses/test-config
   access_token: test_config_token
 """
-        with open(config_file, "w") as f:
-            f.write(config_content)
+        config_file.write_text(config_content, encoding="utf-8")
         
         result = run_command([
             str(python_exe), "-m", "databricks_mcp_server.main",
@@ -236,48 +431,25 @@ databricks:
         return True
 
 
-def test_uvx_simulation():
+def test_uvx_simulation(python_exe=None):
     """Simulate uvx isolation and execution."""
+    if python_exe is None:
+        return run_in_shared_venv(test_uvx_simulation)
+    
     print("\n" + "="*80)
     print("TESTING UVX ISOLATION SIMULATION")
     print("="*80)
     
-    with tempfile.TemporaryDirectory() as temp_dir:
-        venv_path = Path(temp_dir) / "uvx_simulation_venv"
-        
-        # Create completely isolated virtual environment
-        result = run_command([
-            sys.executable, "-m", "venv", str(venv_path), "--clear"
-        ], "Create isolated environment (uvx simulation)")
-        
-        if not result or result.returncode != 0:
-            return False
-        
-        # Get platform-specific paths
-        if sys.platform == "win32":
-            pip_exe = venv_path / "Scripts" / "pip.exe"
-            python_exe = venv_path / "Scripts" / "python.exe"
-        else:
-            pip_exe = venv_path / "bin" / "pip"
-            python_exe = venv_path / "bin" / "python"
-        
-        # Install package with minimal environment
-        clean_env = {
-            'PATH': os.environ.get('PATH', ''),
-            'PYTHONNOUSERSITE': '1',  # Disable user site packages
-            'PYTHONPATH': ''  # Clear Python path
-        }
-        
-        result = run_command([
-            str(pip_exe), "install", "-e", "."
-        ], "Install package in isolated environment", env=clean_env)
-        
-        if not result or result.returncode != 0:
-            return False
-        
-        # Test isolated execution
-        result = run_command([
-            str(python_exe), "-c", """
+    # Run with minimal environment
+    clean_env = {
+        'PATH': os.environ.get('PATH', ''),
+        'PYTHONNOUSERSITE': '1',  # Disable user site packages
+        'PYTHONPATH': ''  # Clear Python path
+    }
+    
+    # Test isolated execution
+    result = run_command([
+        str(python_exe), "-c", """
 import sys
 print(f"Python executable: {sys.executable}")
 print(f"Python path length: {len(sys.path)}")
@@ -294,21 +466,21 @@ if user_site and user_site in sys.path:
 else:
     print("User site packages properly isolated")
 """
-        ], "Test isolated execution", env=clean_env)
-        
-        if not result or result.returncode != 0:
-            print("❌ Isolated execution failed")
-            return False
-        
-        if "Isolated execution successful" in result.stdout:
-            print("✅ UVX isolation simulation passed")
-            return True
-        else:
-            print("❌ UVX isolation simulation failed")
-            return False
+    ], "Test isolated execution", env=clean_env)
+    
+    if not result or result.returncode != 0:
+        print("❌ Isolated execution failed")
+        return False
+    
+    if "Isolated execution successful" in result.stdout:
+        print("✅ UVX isolation simulation passed")
+        return True
+    else:
+        print("❌ UVX isolation simulation failed")
+        return False
 
 
-def test_actual_uvx():
+def test_actual_uvx(root=None):
     """Test actual uvx execution if available."""
     print("\n" + "="*80)
     print("TESTING ACTUAL UVX EXECUTION")
@@ -316,32 +488,39 @@ def test_actual_uvx():
     
     # Check if uvx is available
     try:
-        result = subprocess.run(["uvx", "--version"], capture_output=True, text=True)
-        if result.returncode != 0:
-            print("⚠️  uvx not available - skipping actual uvx test")
-            return True
-        print(f"Found uvx: {result.stdout.strip()}")
-    except FileNotFoundError:
+        returncode = subprocess.run(
+            ["uvx", "--version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5
+        ).returncode
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        returncode = None
+    
+    if returncode != 0:
         print("⚠️  uvx not available - skipping actual uvx test")
         return True
+    print("Found uvx")
+    
+    # Install from a prebuilt wheel so uvx skips the source build
+    wheel = build_cached_wheel()
+    if not wheel:
+        print("❌ Failed to build wheel for uvx")
+        return False
     
     # Create temporary config for testing
-    with tempfile.TemporaryDirectory() as temp_dir:
-        config_file = Path(temp_dir) / "uvx_test.yaml"
+    with scratch_dir(root, "uvx_actual") as work_dir:
+        config_file = work_dir / "uvx_test.yaml"
         config_content = """
 databricks:
   server_hostname: uvx-test.databricks.com
   http_path: /sql/1.0/warehouses/uvx-test
   access_token: uvx_test_token
 """
-        with open(config_file, "w") as f:
-            f.write(config_content)
+        config_file.write_text(config_content, encoding="utf-8")
         
         # Test uvx execution
         result = run_command([
-            "uvx", "--from", ".", "databricks-mcp-server",
+            "uvx", "--from", str(wheel), "databricks-mcp-server",
             "--config", str(config_file), "--validate-config"
-        ], "Test actual uvx execution", timeout=120)
+        ], "Test actual uvx execution", timeout=60)
         
         if result:
             if result.returncode == 0:
@@ -373,35 +552,22 @@ def test_cross_platform_paths():
     print("="*80)
     
     # Test various path scenarios
-    test_paths = [
-        "config.yaml",
-        "./config.yaml",
-        "config/config.yaml",
-        "../config.yaml"
-    ]
-    
     if sys.platform == "win32":
-        test_paths.extend([
-            "C:\\temp\\config.yaml",
-            "config\\config.yaml"
-        ])
+        platform_paths = ["C:\\temp\\config.yaml", "config\\config.yaml"]
     else:
-        test_paths.extend([
-            "/tmp/config.yaml",
-            "~/config.yaml"
-        ])
+        platform_paths = ["/tmp/config.yaml", "~/config.yaml"]
+    test_paths = ["config.yaml", "./config.yaml", "config/config.yaml", "../config.yaml", *platform_paths]
     
     print(f"Testing path handling on {platform.system()}:")
     
-    for test_path in test_paths:
-        try:
-            # Test path normalization
-            normalized = os.path.normpath(test_path)
-            absolute = os.path.abspath(test_path)
-            print(f"  {test_path} -> {normalized} -> {absolute}")
-        except Exception as e:
-            print(f"  ❌ Path error for {test_path}: {e}")
-            return False
+    try:
+        # Test path normalization
+        results = [(path, os.path.normpath(path), os.path.abspath(path)) for path in test_paths]
+    except Exception as e:
+        print(f"  ❌ Path error: {e}")
+        return False
+    
+    print("\n".join(f"  {path} -> {normalized} -> {absolute}" for path, normalized, absolute in results))
     
     print("✅ Cross-platform path handling test passed")
     return True
@@ -413,31 +579,32 @@ def run_pytest_cross_platform_tests():
     print("RUNNING PYTEST CROSS-PLATFORM TESTS")
     print("="*80)
     
-    # Check if pytest is available
-    try:
-        result = subprocess.run([
-            sys.executable, "-m", "pytest", "--version"
-        ], capture_output=True, text=True)
-        if result.returncode != 0:
-            print("⚠️  pytest not available - installing...")
-            install_result = subprocess.run([
-                sys.executable, "-m", "pip", "install", "pytest", "pytest-asyncio"
-            ], capture_output=True, text=True)
-            if install_result.returncode != 0:
-                print("❌ Failed to install pytest")
-                return False
-    except Exception:
-        print("❌ pytest not available")
-        return False
+    # Check if pytest is available without spawning an interpreter
+    if importlib.util.find_spec("pytest") is None:
+        print("⚠️  pytest not available - installing...")
+        install_result = run_command([
+            sys.executable, "-m", "pip", "install", "--disable-pip-version-check",
+            "pytest", "pytest-asyncio", "pytest-xdist"
+        ], "Install pytest", timeout=120, text=False)
+        importlib.invalidate_caches()
+        if not install_result or install_result.returncode != 0 or importlib.util.find_spec("pytest") is None:
+            print("❌ Failed to install pytest")
+            return False
     
-    # Run cross-platform tests
-    result = run_command([
+    pytest_cmd = [
         sys.executable, "-m", "pytest", 
         "tests/test_cross_platform.py",
         "-v", 
         "-m", "integration",
         "--tb=short"
-    ], "Run pytest cross-platform tests", timeout=300)
+    ]
+    
+    # Shard across cores with pytest-xdist when it is installed
+    if importlib.util.find_spec("xdist") is not None:
+        pytest_cmd += ["-n", str(max(1, (os.cpu_count() or 1) - 2)), "--dist=loadfile"]
+    
+    # Run cross-platform tests
+    result = run_command(pytest_cmd, "Run pytest cross-platform tests", timeout=300, text=False)
     
     if result and result.returncode == 0:
         print("✅ Pytest cross-platform tests passed")
@@ -447,6 +614,28 @@ def run_pytest_cross_platform_tests():
         return False
 
 
+def run_tests(tests, jobs=1):
+    """Run the selected test functions, in parallel worker processes when jobs > 1."""
+    if jobs <= 1 or len(tests) <= 1:
+        return {name: func() for name, func in tests}
+    
+    results = {}
+    # Workers started with spawn/forkserver don't inherit the logging setup
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tests)), initializer=configure_logging,
+                             initargs=(logging.getLogger().level,)) as executor:
+        futures = {executor.submit(func): name for name, func in tests}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                print(f"❌ {name} test raised an error: {e}")
+                results[name] = False
+    
+    # Report in the declared order rather than completion order
+    return {name: results[name] for name, _ in tests}
+
+
 def main():
     """Main test runner."""
     parser = argparse.ArgumentParser(description="Cross-platform compatibility test runner")
@@ -456,9 +645,15 @@ def main():
     parser.add_argument("--skip-uvx", action="store_true", help="Skip actual uvx test")
     parser.add_argument("--skip-paths", action="store_true", help="Skip path handling test")
     parser.add_argument("--skip-pytest", action="store_true", help="Skip pytest tests")
+    parser.add_argument("--reuse-venv", action="store_true",
+                        help="Keep the shared venv in the user cache and reuse it across runs")
+    parser.add_argument("--quiet", "-q", action="store_true", help="Don't print platform information")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
+    parser.add_argument("--jobs", "-j", type=int, default=max(1, (os.cpu_count() or 1) - 2),
+                        help="Number of tests to run in parallel (default: CPU count - 2)")
     
     args = parser.parse_args()
+    configure_logging(logging.DEBUG if args.verbose else logging.INFO)
     
     # Change to package directory
     package_dir = Path(__file__).parent
@@ -468,52 +663,63 @@ def main():
     print(f"Package directory: {package_dir}")
     
     # Print platform information
-    print_platform_info()
-    
-    success = True
-    test_results = {}
-    
-    # Run tests
-    if not args.skip_installation:
-        test_results["Installation"] = test_package_installation()
-        success = success and test_results["Installation"]
-    
-    if not args.skip_config:
-        test_results["Configuration"] = test_configuration_handling()
-        success = success and test_results["Configuration"]
-    
-    if not args.skip_uvx_sim:
-        test_results["UVX Simulation"] = test_uvx_simulation()
-        success = success and test_results["UVX Simulation"]
-    
-    if not args.skip_uvx:
-        test_results["UVX Actual"] = test_actual_uvx()
-        success = success and test_results["UVX Actual"]
-    
-    if not args.skip_paths:
-        test_results["Path Handling"] = test_cross_platform_paths()
-        success = success and test_results["Path Handling"]
+    if not args.quiet:
+        print_platform_info()
+    
+    venv_tests = {test_package_installation, test_configuration_handling, test_uvx_simulation}
+    scratch_tests = {test_configuration_handling, test_actual_uvx}
+    selected = [
+        (name, func)
+        for name, func, skipped in [
+            ("Installation", test_package_installation, args.skip_installation),
+            ("Configuration", test_configuration_handling, args.skip_config),
+            ("UVX Simulation", test_uvx_simulation, args.skip_uvx_sim),
+            ("UVX Actual", test_actual_uvx, args.skip_uvx),
+            ("Path Handling", test_cross_platform_paths, args.skip_paths),
+            ("Pytest Tests", run_pytest_cross_platform_tests, args.skip_pytest),
+        ]
+        if not skipped
+    ]
     
-    if not args.skip_pytest:
-        test_results["Pytest Tests"] = run_pytest_cross_platform_tests()
-        success = success and test_results["Pytest Tests"]
+    with ExitStack() as stack:
+        # One scratch directory for the whole run, removed once at the end
+        root = stack.enter_context(tempfile.TemporaryDirectory(prefix="dbmcp_xplat_"))
+        
+        # One venv serves every installation-dependent test
+        python_exe = None
+        if any(func in venv_tests for _, func in selected):
+            python_exe = stack.enter_context(shared_venv(root, reuse=args.reuse_venv))
+        
+        tests = []
+        for name, func in selected:
+            venv_args = (python_exe,) if func in venv_tests else ()
+            kwargs = {"root": root} if func in scratch_tests else {}
+            if func in venv_tests and python_exe is None:
+                func = venv_unavailable
+            elif venv_args or kwargs:
+                func = partial(func, *venv_args, **kwargs)
+            tests.append((name, func))
+        
+        # Run tests
+        test_results = run_tests(tests, args.jobs)
+        success = all(test_results.values())
     
     # Summary
     print("\n" + "="*80)
     print("CROSS-PLATFORM COMPATIBILITY TEST SUMMARY")
     print("="*80)
     
-    for test_name, result in test_results.items():
-        status = "✅ PASSED" if result else "❌ FAILED"
-        print(f"{test_name:20} {status}")
+    sys.stdout.write("".join(
+        f"{test_name:20} {STATUS_LABELS[bool(result)]}\n" for test_name, result in test_results.items()
+    ))
     
-    print(f"\nPlatform: {platform.system()} {platform.release()}")
+    print(f"\nPlatform: {platform_label()}")
     print(f"Python: {sys.version.split()[0]}")
     
     if success:
         print("\n🎉 All cross-platform compatibility tests passed!")
         print(f"\nThe databricks-mcp-server package is compatible with:")
-        print(f"- {platform.system()} {platform.release()}")
+        print(f"- {platform_label()}")
         print(f"- Python {sys.version.split()[0]}")
         print("- uvx isolation environment")
         return 0
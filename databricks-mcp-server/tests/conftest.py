@@ -2,19 +2,114 @@
 Pytest configuration and fixtures for databricks-mcp-server tests.
 """
 
+import json
 import os
-import tempfile
+import subprocess
+import sys
 import shutil
+from importlib.util import find_spec
 from pathlib import Path
+from unittest import mock
 import pytest
 
 
+# Test names containing any of these are marked slow
+SLOW_TEST_TOKENS = ("install", "build", "package")
+
+# Default per-test limit in seconds when pytest-timeout is installed; fixture setup is not
+# counted. Several integration tests still pip-install in the test body, so this guards
+# against hangs rather than bounding normal runs.
+DEFAULT_TEST_TIMEOUT = 300
+
+# Subprocess limits in seconds for the session fixtures, which the per-test limit does not cover
+BUILD_TIMEOUT = 300
+VENV_TIMEOUT = 120
+
+
 @pytest.fixture(scope="session")
 def package_root():
     """Get the package root directory."""
     return Path(__file__).parent.parent
 
 
+def _build_distribution(package_root, dist_dir):
+    """Build the wheel and sdist into dist_dir and return their paths.
+    
+    When hatchling is already installed the build reuses it instead of
+    provisioning an isolated build environment.
+    """
+    cmd = [sys.executable, "-m", "build", "--outdir", dist_dir, package_root]
+    if find_spec("hatchling") is not None:
+        cmd.append("--no-isolation")
+    
+    result = subprocess.run(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        timeout=BUILD_TIMEOUT
+    )
+    assert result.returncode == 0, f"Build failed: {result.stderr}"
+    
+    return _find_distribution(dist_dir)
+
+
+def _find_distribution(dist_dir):
+    """Return the single wheel and sdist in dist_dir."""
+    wheel_files = list(dist_dir.glob("*.whl"))
+    tar_files = list(dist_dir.glob("*.tar.gz"))
+    assert len(wheel_files) == 1, f"Expected 1 wheel file, found {len(wheel_files)}"
+    assert len(tar_files) == 1, f"Expected 1 tar file, found {len(tar_files)}"
+    
+    return wheel_files[0], tar_files[0]
+
+
+@pytest.fixture(scope="session")
+def built_dist(package_root, tmp_path_factory):
+    """Build the project's wheel and sdist once per session.
+    
+    The build writes straight into a temporary --outdir, so the source tree
+    is built in place without copying it and its own dist/ is left alone.
+    Under pytest-xdist the first worker builds while holding a file lock and
+    the others reuse its artifacts from a shared manifest.
+    Setting DATABRICKS_MCP_DIST_DIR to a directory that already holds a
+    wheel and sdist (e.g. restored from a CI cache) skips the build.
+    Returns (dist directory, wheel path, sdist path).
+    """
+    prebuilt_dir = os.environ.get("DATABRICKS_MCP_DIST_DIR")
+    if prebuilt_dir:
+        dist_dir = Path(prebuilt_dir).resolve()
+        return (dist_dir, *_find_distribution(dist_dir))
+    
+    if "PYTEST_XDIST_WORKER" not in os.environ:
+        dist_dir = tmp_path_factory.mktemp("built_dist")
+        return (dist_dir, *_build_distribution(package_root, dist_dir))
+    
+    from filelock import FileLock
+    
+    # The base temp dir is per worker; its parent is shared by the whole run
+    shared_root = tmp_path_factory.getbasetemp().parent
+    manifest = shared_root / "built_dist.json"
+    with FileLock(str(manifest) + ".lock"):
+        if manifest.is_file():
+            paths = json.loads(manifest.read_text())
+        else:
+            dist_dir = shared_root / "built_dist"
+            dist_dir.mkdir(exist_ok=True)
+            wheel_file, sdist_file = _build_distribution(package_root, dist_dir)
+            paths = {"dist_dir": str(dist_dir), "wheel": str(wheel_file), "sdist": str(sdist_file)}
+            manifest.write_text(json.dumps(paths))
+    
+    return Path(paths["dist_dir"]), Path(paths["wheel"]), Path(paths["sdist"])
+
+
+@pytest.fixture(scope="session")
+def uvx_available():
+    """Skip the requesting test unless uvx is on PATH."""
+    if shutil.which("uvx") is None:
+        pytest.skip("uvx not available for testing")
+
+
 @pytest.fixture
 def temp_config_dir(tmp_path):
     """Create a temporary directory for config files."""
@@ -44,19 +139,14 @@ def sample_config_data():
 @pytest.fixture
 def clean_databricks_env():
     """Clean Databricks environment variables for testing."""
-    original_env = {}
-    
     # Store and remove existing Databricks env vars
-    for key in list(os.environ.keys()):
-        if key.startswith('DATABRICKS'):
-            original_env[key] = os.environ[key]
-            del os.environ[key]
+    databricks_keys = tuple(key for key in os.environ if key.startswith('DATABRICKS'))
+    original_env = {key: os.environ.pop(key) for key in databricks_keys}
     
     yield
     
     # Restore original environment
-    for key, value in original_env.items():
-        os.environ[key] = value
+    os.environ.update(original_env)
 
 
 @pytest.fixture
@@ -70,57 +160,155 @@ def mock_databricks_env():
         'DATABRICKS_SCHEMA': 'mock_schema'
     }
     
-    original_env = {}
+    with mock.patch.dict(os.environ, env_vars):
+        yield env_vars
+
+
+def _create_venv(venv_path):
+    """Create a virtual environment at venv_path, skipping the test if that fails.
     
-    # Store original values and set mock values
-    for key, value in env_vars.items():
-        if key in os.environ:
-            original_env[key] = os.environ[key]
-        os.environ[key] = value
+    Uses uv when it is on PATH, seeding pip so tests can still call it.
+    """
+    uv = shutil.which("uv")
+    if uv:
+        cmd = [uv, "venv", "--seed", "--python", sys.executable, venv_path]
+    else:
+        cmd = [sys.executable, "-m", "venv", venv_path]
     
-    yield env_vars
+    result = subprocess.run(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=VENV_TIMEOUT
+    )
     
-    # Restore original environment
-    for key in env_vars.keys():
-        if key in original_env:
-            os.environ[key] = original_env[key]
-        else:
-            del os.environ[key]
+    if result.returncode != 0:
+        pytest.skip(f"Could not create virtual environment: {result.stderr}")
+
+
+def _clone_venv(source, dest):
+    """Clone a POSIX virtual environment by hard-linking its files.
+    
+    Scripts in bin/ embed the venv's absolute path (pip's shebang, activate), so
+    those are rewritten as real copies pointing at the clone.
+    """
+    shutil.copytree(source, dest, symlinks=True, copy_function=os.link)
+    
+    old_prefix, new_prefix = bytes(source), bytes(dest)
+    for script in (dest / "bin").iterdir():
+        if script.is_symlink() or not script.is_file():
+            continue
+        content = script.read_bytes()
+        if old_prefix in content:
+            mode = script.stat().st_mode
+            script.unlink()
+            script.write_bytes(content.replace(old_prefix, new_prefix))
+            script.chmod(mode)
+
+
+@pytest.fixture(scope="session")
+def base_venv(tmp_path_factory):
+    """Create one virtual environment per session for the other venv fixtures to clone."""
+    venv_path = tmp_path_factory.mktemp("base_venv") / "venv"
+    _create_venv(venv_path)
+    return venv_path
+
+
+def _venv_executables(venv_path):
+    """Paths to a virtual environment's python and pip."""
+    bin_dir = venv_path / ("Scripts" if sys.platform == "win32" else "bin")
+    suffix = ".exe" if sys.platform == "win32" else ""
+    return {
+        'path': venv_path,
+        'python': bin_dir / f"python{suffix}",
+        'pip': bin_dir / f"pip{suffix}"
+    }
+
+
+def _new_venv(venv_path, request):
+    """Create a venv at venv_path, cloning the session's base venv where possible."""
+    if sys.platform == "win32":
+        # Script launchers embed the absolute interpreter path, so build a fresh venv
+        _create_venv(venv_path)
+    else:
+        _clone_venv(request.getfixturevalue("base_venv"), venv_path)
+    
+    return _venv_executables(venv_path)
+
+
+def _pip_install(venv, *args):
+    """Install packages into a venv, with uv pip when uv is on PATH."""
+    uv = shutil.which("uv")
+    if uv:
+        cmd = [uv, "pip", "install", "--python", venv['python'], *args]
+    else:
+        cmd = [venv['pip'], "install", *args]
+    
+    return subprocess.run(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=BUILD_TIMEOUT
+    )
 
 
 @pytest.fixture
-def isolated_venv(tmp_path):
+def isolated_venv(tmp_path, request):
     """Create an isolated virtual environment for testing."""
-    import subprocess
-    import sys
+    return _new_venv(tmp_path / "test_venv", request)
+
+
+@pytest.fixture(scope="session")
+def installed_venv(tmp_path_factory, package_root, request):
+    """Virtual environment with the package installed in editable mode, once per session.
     
-    venv_path = tmp_path / "test_venv"
+    Tests share it, so they must not install or remove packages in it; use
+    isolated_venv for that.
+    """
+    venv = _new_venv(tmp_path_factory.mktemp("installed_venv") / "venv", request)
     
-    # Create virtual environment
-    result = subprocess.run([
-        sys.executable, "-m", "venv", str(venv_path)
-    ], capture_output=True, text=True)
+    result = _pip_install(venv, "-e", package_root)
+    assert result.returncode == 0, f"Editable install failed: {result.stderr}"
     
-    if result.returncode != 0:
-        pytest.skip(f"Could not create virtual environment: {result.stderr}")
+    return venv
+
+
+@pytest.fixture(scope="session")
+def wheel_installed_venv(built_dist, tmp_path_factory, request):
+    """Virtual environment with the session's built wheel installed, shared by the session."""
+    _, wheel_file, _ = built_dist
+    venv = _new_venv(tmp_path_factory.mktemp("wheel_venv") / "venv", request)
     
-    # Return paths to executables
-    if sys.platform == "win32":
-        return {
-            'path': venv_path,
-            'python': venv_path / "Scripts" / "python.exe",
-            'pip': venv_path / "Scripts" / "pip.exe"
-        }
-    else:
-        return {
-            'path': venv_path,
-            'python': venv_path / "bin" / "python",
-            'pip': venv_path / "bin" / "pip"
-        }
+    result = _pip_install(venv, wheel_file)
+    assert result.returncode == 0, f"Wheel installation failed: {result.stderr}"
+    
+    return venv
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_cmdline_main(config):
+    """Spread the suite over all CPUs with pytest-xdist when it is installed.
+    
+    Tests from one file stay on the same worker. Pass -n 0 to run serially.
+    """
+    if (
+        not config.pluginmanager.hasplugin("xdist")
+        or config.option.numprocesses is not None
+        or "PYTEST_XDIST_WORKER" in os.environ
+        or (os.cpu_count() or 1) < 2
+    ):
+        return
+    
+    config.option.numprocesses = "auto"
+    if config.option.dist == "no":
+        config.option.dist = "loadfile"
 
 
 def pytest_configure(config):
-    """Configure pytest with custom markers."""
+    """Configure pytest with custom markers.
+    
+    Integration and external tests are deselected unless a -m expression is
+    given, so a plain pytest run stays on the fast unit tests; pass
+    -m integration or -m external to run them.
+    """
+    config.option.strict_markers = True
+    if not config.option.markexpr:
+        config.option.markexpr = "not integration and not external"
+    
     config.addinivalue_line(
         "markers", "integration: mark test as integration test"
     )
@@ -130,19 +318,36 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "requires_uvx: mark test as requiring uvx installation"
     )
+    config.addinivalue_line(
+        "markers", "external: mark test as running external tools such as uvx"
+    )
+    config.addinivalue_line(
+        "markers", "timeout(seconds): override the per-test time limit (needs pytest-timeout)"
+    )
 
 
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to handle markers."""
+    # Apply the default time limit unless one was given on the command line or in the environment
+    apply_default_timeout = (
+        config.pluginmanager.hasplugin("timeout")
+        and config.getoption("timeout", None) is None
+        and "PYTEST_TIMEOUT" not in os.environ
+    )
+    
     # Add integration marker to integration tests
     for item in items:
-        if "test_integration" in str(item.fspath):
+        name = item.name.lower()
+        if "test_integration" in item.fspath.strpath:
             item.add_marker(pytest.mark.integration)
         
         # Mark uvx tests
-        if "uvx" in item.name.lower():
+        if "uvx" in name:
             item.add_marker(pytest.mark.requires_uvx)
         
         # Mark slow tests
-        if any(marker in item.name.lower() for marker in ["install", "build", "package"]):
-            item.add_marker(pytest.mark.slow)
\ No newline at end of file
+        if any(token in name for token in SLOW_TEST_TOKENS):
+            item.add_marker(pytest.mark.slow)
+        
+        if apply_default_timeout and item.get_closest_marker("timeout") is None:
+            item.add_marker(pytest.mark.timeout(DEFAULT_TEST_TIMEOUT, method="thread", func_only=True))
\ No newline at end of file
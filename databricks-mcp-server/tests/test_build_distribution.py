@@ -4,82 +4,155 @@ Tests for build and distribution workflow.
 These tests validate that the package can be built, distributed, and installed correctly.
 """
 
+import io
+import re
+import runpy
 import shutil
 import subprocess
 import sys
-import tempfile
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
 from unittest import mock
 
 import pytest
+import yaml
 
 
-class TestBuildDistribution:
-    """Test build and distribution functionality."""
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = PROJECT_ROOT / "scripts"
+
+# Make the release scripts importable; appended so scripts/build.py cannot
+# shadow the installed build package
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.append(str(SCRIPTS_DIR))
+
+from bump_version import bump_version, format_version, parse_version  # noqa: E402
+
+# Runs the console-script target with --help, the way the generated entry point script does
+HELP_VIA_ENTRY_POINT = (
+    "import sys; sys.argv = ['databricks-mcp-server', '--help']; "
+    "from databricks_mcp_server.main import main; main()"
+)
+
+
+# Names of the targets defined in a Makefile
+MAKEFILE_TARGET_PATTERN = re.compile(r"^([\w.-]+)\s*:", re.MULTILINE)
+
+# libyaml-backed loader when available
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _load_workflow(name, description):
+    """Parse a GitHub Actions workflow."""
+    return yaml.load(_read_project_file(f".github/workflows/{name}", description), Loader=YAML_LOADER)
+
+
+def _step_names(workflow):
+    """Names of every step across all jobs in a parsed workflow."""
+    return {
+        step.get("name", "")
+        for job in workflow["jobs"].values()
+        for step in job.get("steps", [])
+    }
+
+
+def _read_project_file(relative_path, description):
+    """Read a project file, failing the test with a clear message if it is missing."""
+    path = PROJECT_ROOT / relative_path
+    assert path.exists(), f"{description} not found"
+    return path.read_text()
+
+
+def _requirement_names(requirements):
+    """Distribution names from a list of PEP 508 requirement strings."""
+    return {re.split(r"[\s<>=!~;\[]", req, maxsplit=1)[0].lower() for req in requirements}
+
+
+def _run_script(name, *args, description):
+    """Run a scripts/ entry point in-process and return (returncode, stdout, stderr).
     
-    @pytest.fixture
-    def project_root(self):
-        """Get project root directory."""
-        return Path(__file__).parent.parent
+    runpy keeps the scripts out of sys.modules, so scripts/build.py does not
+    shadow the ``build`` package used by the distribution tests.
+    """
+    script_path = SCRIPTS_DIR / name
+    assert script_path.exists(), f"{description} not found"
     
-    @pytest.fixture
-    def dist_dir(self, project_root):
-        """Get distribution directory."""
-        return project_root / "dist"
+    stdout, stderr = io.StringIO(), io.StringIO()
+    returncode = 0
+    with mock.patch.object(sys, "argv", [str(script_path), *args]), \
+            redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            runpy.run_path(str(script_path), run_name="__main__")
+        except SystemExit as exc:
+            returncode = exc.code if isinstance(exc.code, int) else int(exc.code is not None)
+    return returncode, stdout.getvalue(), stderr.getvalue()
+
+
+@pytest.fixture(scope="session")
+def pyproject_data():
+    """pyproject.toml parsed once per session."""
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:
+        tomllib = pytest.importorskip("tomli")
+    return tomllib.loads(_read_project_file("pyproject.toml", "pyproject.toml"))
+
+
+@pytest.fixture(scope="session")
+def makefile_content():
+    """Contents of the Makefile, read once per session."""
+    return _read_project_file("Makefile", "Makefile")
+
+
+@pytest.fixture(scope="session")
+def build_workflow():
+    """Build workflow, parsed once per session."""
+    return _load_workflow("build.yml", "Build workflow")
+
+
+@pytest.fixture(scope="session")
+def release_workflow():
+    """Release workflow, parsed once per session."""
+    return _load_workflow("release.yml", "Release workflow")
+
+
+class TestBuildDistribution:
+    """Test build and distribution functionality."""
     
-    def test_pyproject_toml_valid(self, project_root):
+    def test_pyproject_toml_valid(self, pyproject_data):
         """Test that pyproject.toml is valid and contains required fields."""
-        pyproject_path = project_root / "pyproject.toml"
-        assert pyproject_path.exists(), "pyproject.toml not found"
-        
-        content = pyproject_path.read_text()
+        project = pyproject_data["project"]
         
         # Check required fields
-        required_fields = [
-            'name = "databricks-mcp-server"',
-            'version =',
-            'description =',
-            'requires-python =',
-            'dependencies =',
-            '[project.scripts]',
-            'databricks-mcp-server =',
-            '[build-system]',
-            'requires = ["hatchling"]',
-            'build-backend = "hatchling.build"'
-        ]
+        assert project["name"] == "databricks-mcp-server"
+        for field in ("version", "description", "requires-python", "dependencies", "scripts"):
+            assert field in project, f"Required field missing: {field}"
         
-        for field in required_fields:
-            assert field in content, f"Required field missing: {field}"
+        build_system = pyproject_data["build-system"]
+        assert build_system["requires"] == ["hatchling"]
+        assert build_system["build-backend"] == "hatchling.build"
     
-    def test_entry_point_configuration(self, project_root):
+    def test_entry_point_configuration(self, pyproject_data):
         """Test that entry point is correctly configured."""
-        pyproject_path = project_root / "pyproject.toml"
-        content = pyproject_path.read_text()
-        
         # Check entry point
-        assert 'databricks-mcp-server = "databricks_mcp_server.main:main"' in content
+        scripts = pyproject_data["project"]["scripts"]
+        assert scripts["databricks-mcp-server"] == "databricks_mcp_server.main:main"
     
-    def test_dependencies_specified(self, project_root):
+    def test_dependencies_specified(self, pyproject_data):
         """Test that all required dependencies are specified."""
-        pyproject_path = project_root / "pyproject.toml"
-        content = pyproject_path.read_text()
-        
-        required_deps = [
+        required_deps = {
             "databricks-sql-connector",
             "requests",
             "pyyaml",
             "mcp",
-        ]
+        }
         
-        for dep in required_deps:
-            assert dep in content, f"Required dependency missing: {dep}"
+        missing = required_deps - _requirement_names(pyproject_data["project"]["dependencies"])
+        assert not missing, f"Required dependencies missing: {sorted(missing)}"
     
-    def test_optional_dependencies(self, project_root):
+    def test_optional_dependencies(self, pyproject_data):
         """Test that development dependencies are specified."""
-        pyproject_path = project_root / "pyproject.toml"
-        content = pyproject_path.read_text()
-        
-        dev_deps = [
+        dev_deps = {
             "pytest",
             "pytest-asyncio",
             "pytest-cov",
@@ -87,214 +160,109 @@ class TestBuildDistribution:
             "isort",
             "mypy",
             "flake8",
-        ]
+        }
         
-        for dep in dev_deps:
-            assert dep in content, f"Development dependency missing: {dep}"
+        dev_requirements = pyproject_data["project"]["optional-dependencies"]["dev"]
+        missing = dev_deps - _requirement_names(dev_requirements)
+        assert not missing, f"Development dependencies missing: {sorted(missing)}"
     
     @pytest.mark.integration
-    def test_package_build(self, project_root, tmp_path):
+    def test_package_build(self, built_dist):
         """Test that package can be built successfully."""
-        # Copy project to temporary directory to avoid polluting source
-        import shutil
-        temp_project = tmp_path / "project"
-        shutil.copytree(project_root, temp_project, ignore=shutil.ignore_patterns(
-            "dist", "build", "*.egg-info", "__pycache__", ".pytest_cache"
-        ))
-        
-        # Build package
-        result = subprocess.run(
-            [sys.executable, "-m", "build"],
-            cwd=temp_project,
-            capture_output=True,
-            text=True
-        )
-        
-        assert result.returncode == 0, f"Build failed: {result.stderr}"
+        dist_dir, wheel_file, sdist_file = built_dist
         
         # Check that distribution files were created
-        dist_dir = temp_project / "dist"
         assert dist_dir.exists(), "dist directory not created"
         
         wheel_files = list(dist_dir.glob("*.whl"))
         tar_files = list(dist_dir.glob("*.tar.gz"))
         
-        assert len(wheel_files) == 1, f"Expected 1 wheel file, found {len(wheel_files)}"
-        assert len(tar_files) == 1, f"Expected 1 tar file, found {len(tar_files)}"
+        assert wheel_files == [wheel_file], f"Expected 1 wheel file, found {len(wheel_files)}"
+        assert tar_files == [sdist_file], f"Expected 1 tar file, found {len(tar_files)}"
     
     @pytest.mark.integration
-    def test_package_check(self, project_root, tmp_path):
+    def test_package_check(self, built_dist):
         """Test that built package passes twine check."""
-        # Build package first
-        import shutil
-        temp_project = tmp_path / "project"
-        shutil.copytree(project_root, temp_project, ignore=shutil.ignore_patterns(
-            "dist", "build", "*.egg-info", "__pycache__", ".pytest_cache"
-        ))
+        twine_check = pytest.importorskip("twine.commands.check").check
+        _, wheel_file, sdist_file = built_dist
         
-        # Build
-        subprocess.run(
-            [sys.executable, "-m", "build"],
-            cwd=temp_project,
-            check=True,
-            capture_output=True
-        )
+        # Check with twine in-process
+        output = io.StringIO()
+        with redirect_stdout(output):
+            failed = twine_check([str(wheel_file), str(sdist_file)])
         
-        # Check with twine
-        result = subprocess.run(
-            ["twine", "check", "dist/*"],
-            cwd=temp_project,
-            capture_output=True,
-            text=True
-        )
-        
-        assert result.returncode == 0, f"Twine check failed: {result.stderr}"
-        assert "PASSED" in result.stdout, "Package validation failed"
+        assert not failed, f"Twine check failed: {output.getvalue()}"
+        assert output.getvalue().count("PASSED") == 2, "Package validation failed"
     
     @pytest.mark.integration
-    def test_wheel_installation(self, project_root, tmp_path):
+    def test_wheel_installation(self, wheel_installed_venv):
         """Test that wheel can be installed and entry point works."""
-        # Build package
-        import shutil
-        temp_project = tmp_path / "project"
-        shutil.copytree(project_root, temp_project, ignore=shutil.ignore_patterns(
-            "dist", "build", "*.egg-info", "__pycache__", ".pytest_cache"
-        ))
-        
-        subprocess.run(
-            [sys.executable, "-m", "build"],
-            cwd=temp_project,
-            check=True,
-            capture_output=True
-        )
-        
-        # Create virtual environment
-        venv_dir = tmp_path / "test_env"
-        subprocess.run(
-            [sys.executable, "-m", "venv", str(venv_dir)],
-            check=True,
-            capture_output=True
-        )
-        
-        # Get paths
+        # The session fixture has already installed the built wheel
+        python_exe = wheel_installed_venv['python']
         if sys.platform == "win32":
-            python_exe = venv_dir / "Scripts" / "python.exe"
-            entry_point = venv_dir / "Scripts" / "databricks-mcp-server.exe"
+            entry_point = wheel_installed_venv['path'] / "Scripts" / "databricks-mcp-server.exe"
         else:
-            python_exe = venv_dir / "bin" / "python"
-            entry_point = venv_dir / "bin" / "databricks-mcp-server"
-        
-        # Find wheel file
-        wheel_files = list((temp_project / "dist").glob("*.whl"))
-        assert len(wheel_files) == 1, "Expected exactly one wheel file"
-        wheel_file = wheel_files[0]
-        
-        # Install wheel
-        result = subprocess.run(
-            [str(python_exe), "-m", "pip", "install", str(wheel_file)],
-            capture_output=True,
-            text=True
-        )
-        assert result.returncode == 0, f"Installation failed: {result.stderr}"
+            entry_point = wheel_installed_venv['path'] / "bin" / "databricks-mcp-server"
         
         # Test entry point exists
         assert entry_point.exists(), f"Entry point not found: {entry_point}"
         
-        # Test entry point works
+        # Test the installed package imports and its entry point function handles --help,
+        # in one interpreter rather than one for the script and one for the import
         result = subprocess.run(
-            [str(entry_point), "--help"],
+            [python_exe, "-c", HELP_VIA_ENTRY_POINT],
             capture_output=True,
-            text=True
+            text=True,
+            timeout=10
         )
         assert result.returncode == 0, f"Entry point failed: {result.stderr}"
         assert "databricks-mcp-server" in result.stdout.lower()
-        
-        # Test import
-        result = subprocess.run(
-            [str(python_exe), "-c", "import databricks_mcp_server; print('OK')"],
-            capture_output=True,
-            text=True
-        )
-        assert result.returncode == 0, f"Import failed: {result.stderr}"
-        assert "OK" in result.stdout
     
     @pytest.mark.integration
     @pytest.mark.skipif(not shutil.which("uvx"), reason="uvx not available")
-    def test_uvx_installation(self, project_root, tmp_path):
+    @pytest.mark.timeout(90)
+    def test_uvx_installation(self, built_dist):
         """Test that package can be installed and run with uvx."""
-        import shutil
-        
-        # Build package
-        temp_project = tmp_path / "project"
-        shutil.copytree(project_root, temp_project, ignore=shutil.ignore_patterns(
-            "dist", "build", "*.egg-info", "__pycache__", ".pytest_cache"
-        ))
-        
-        subprocess.run(
-            [sys.executable, "-m", "build"],
-            cwd=temp_project,
-            check=True,
-            capture_output=True
-        )
-        
-        # Find wheel file
-        wheel_files = list((temp_project / "dist").glob("*.whl"))
-        assert len(wheel_files) == 1, "Expected exactly one wheel file"
-        wheel_file = wheel_files[0]
+        _, wheel_file, _ = built_dist
         
         # Test uvx installation
         result = subprocess.run(
-            ["uvx", "--from", str(wheel_file), "databricks-mcp-server", "--help"],
+            ["uvx", "--from", wheel_file, "databricks-mcp-server", "--help"],
             capture_output=True,
-            text=True
+            text=True,
+            timeout=60
         )
         
         assert result.returncode == 0, f"uvx installation failed: {result.stderr}"
         assert "databricks-mcp-server" in result.stdout.lower()
     
-    def test_version_management_script(self, project_root):
+    def test_version_management_script(self):
         """Test version management script functionality."""
-        script_path = project_root / "scripts" / "bump_version.py"
-        assert script_path.exists(), "Version management script not found"
-        
         # Test dry run
-        result = subprocess.run(
-            [sys.executable, str(script_path), "patch", "--dry-run"],
-            cwd=project_root,
-            capture_output=True,
-            text=True
+        returncode, stdout, stderr = _run_script(
+            "bump_version.py", "patch", "--dry-run", description="Version management script"
         )
         
-        assert result.returncode == 0, f"Version script failed: {result.stderr}"
-        assert "Current version:" in result.stdout
-        assert "New version:" in result.stdout
-        assert "Dry run" in result.stdout
+        assert returncode == 0, f"Version script failed: {stderr or stdout}"
+        assert "Current version:" in stdout
+        assert "New version:" in stdout
+        assert "Dry run" in stdout
     
-    def test_build_script(self, project_root):
+    def test_build_script(self):
         """Test build script functionality."""
-        script_path = project_root / "scripts" / "build.py"
-        assert script_path.exists(), "Build script not found"
-        
         # Test help
-        result = subprocess.run(
-            [sys.executable, str(script_path), "--help"],
-            capture_output=True,
-            text=True
+        returncode, stdout, stderr = _run_script(
+            "build.py", "--help", description="Build script"
         )
         
-        assert result.returncode == 0, f"Build script help failed: {result.stderr}"
-        assert "--clean" in result.stdout
-        assert "--build" in result.stdout
-        assert "--test-install" in result.stdout
+        assert returncode == 0, f"Build script help failed: {stderr}"
+        assert "--clean" in stdout
+        assert "--build" in stdout
+        assert "--test-install" in stdout
     
-    def test_makefile_exists(self, project_root):
+    def test_makefile_exists(self, makefile_content):
         """Test that Makefile exists and contains expected targets."""
-        makefile_path = project_root / "Makefile"
-        assert makefile_path.exists(), "Makefile not found"
-        
-        content = makefile_path.read_text()
-        
-        expected_targets = [
+        expected_targets = {
             "clean",
             "lint",
             "test",
@@ -303,64 +271,45 @@ class TestBuildDistribution:
             "test-install",
             "test-uvx",
             "release",
-        ]
+        }
         
-        for target in expected_targets:
-            assert f"{target}:" in content, f"Makefile target missing: {target}"
+        missing = expected_targets - set(MAKEFILE_TARGET_PATTERN.findall(makefile_content))
+        assert not missing, f"Makefile targets missing: {sorted(missing)}"
     
-    def test_github_workflows_exist(self, project_root):
+    def test_github_workflows_exist(self, build_workflow, release_workflow):
         """Test that GitHub Actions workflows exist."""
-        workflows_dir = project_root / ".github" / "workflows"
-        
-        build_workflow = workflows_dir / "build.yml"
-        release_workflow = workflows_dir / "release.yml"
-        
-        assert build_workflow.exists(), "Build workflow not found"
-        assert release_workflow.exists(), "Release workflow not found"
-        
         # Check build workflow content
-        build_content = build_workflow.read_text()
-        assert "name: Build and Test" in build_content
-        assert "strategy:" in build_content
-        assert "matrix:" in build_content
-        assert "os:" in build_content
-        assert "python-version:" in build_content
-        
-        # Check release workflow content
-        release_content = release_workflow.read_text()
-        assert "name: Release" in release_content
-        assert "tags:" in release_content
-        assert "TestPyPI" in release_content
-        assert "PyPI" in release_content
+        assert build_workflow["name"] == "Build and Test"
+        matrix = build_workflow["jobs"]["test"]["strategy"]["matrix"]
+        assert {"os", "python-version"} <= matrix.keys()
+        
+        # Check release workflow content; PyYAML reads the bare "on" key as True
+        assert release_workflow["name"] == "Release"
+        triggers = release_workflow.get("on", release_workflow.get(True))
+        assert "tags" in triggers["push"]
+        
+        step_names = _step_names(release_workflow)
+        assert "Publish to TestPyPI" in step_names
+        assert "Publish to PyPI" in step_names
     
-    def test_validation_script_exists(self, project_root):
+    def test_validation_script_exists(self):
         """Test that distribution validation script exists."""
-        validation_script = project_root / "scripts" / "validate_distribution.py"
-        assert validation_script.exists(), "Distribution validation script not found"
-        
         # Test help
-        result = subprocess.run(
-            [sys.executable, str(validation_script), "--help"],
-            capture_output=True,
-            text=True
+        returncode, stdout, stderr = _run_script(
+            "validate_distribution.py", "--help", description="Distribution validation script"
         )
         
-        assert result.returncode == 0, f"Validation script help failed: {result.stderr}"
-        assert "--project-root" in result.stdout
-        assert "--report" in result.stdout
-        assert "--skip-uvx" in result.stdout
+        assert returncode == 0, f"Validation script help failed: {stderr}"
+        assert "--project-root" in stdout
+        assert "--report" in stdout
+        assert "--skip-uvx" in stdout
 
 
 class TestVersionManagement:
     """Test version management functionality."""
     
-    def test_version_parsing(self, project_root):
+    def test_version_parsing(self):
         """Test version parsing functionality."""
-        # Import the functions from the script
-        import sys
-        sys.path.insert(0, str(project_root / "scripts"))
-        from bump_version import parse_version, format_version
-        
         # Test valid versions
         assert parse_version("1.0.0") == (1, 0, 0)
         assert parse_version("2.5.10") == (2, 5, 10)
@@ -369,21 +318,14 @@ class TestVersionManagement:
         assert format_version(1, 0, 0) == "1.0.0"
         assert format_version(2, 5, 10) == "2.5.10"
     
-    def test_version_bumping(self, project_root):
+    @pytest.mark.parametrize("current, bump_type, expected", [
+        ("1.0.0", "patch", "1.0.1"),
+        ("1.0.5", "patch", "1.0.6"),
+        ("1.0.5", "minor", "1.1.0"),
+        ("1.5.10", "minor", "1.6.0"),
+        ("1.5.10", "major", "2.0.0"),
+        ("5.2.1", "major", "6.0.0"),
+    ])
+    def test_version_bumping(self, current, bump_type, expected):
         """Test version bumping logic."""
-        # Import the function from the script
-        import sys
-        sys.path.insert(0, str(project_root / "scripts"))
-        from bump_version import bump_version
-        
-        # Test patch bump
-        assert bump_version("1.0.0", "patch") == "1.0.1"
-        assert bump_version("1.0.5", "patch") == "1.0.6"
-        
-        # Test minor bump
-        assert bump_version("1.0.5", "minor") == "1.1.0"
-        assert bump_version("1.5.10", "minor") == "1.6.0"
-        
-        # Test major bump
-        assert bump_version("1.5.10", "major") == "2.0.0"
-        assert bump_version("5.2.1", "major") == "6.0.0"
\ No newline at end of file
+        assert bump_version(current, bump_type) == expected
@@ -4,16 +4,35 @@ Unit tests for configuration management functionality.
 Tests configuration loading, validation, and environment variable processing.
 """
 
-import os
 import pytest
-import tempfile
 import yaml
-from pathlib import Path
-from unittest.mock import Mock, patch, mock_open
+from types import MappingProxyType
 
 from databricks_mcp_server.config import ConfigManager, DatabricksConfig, ServerConfig, ConfigurationError
 
 
+# Use the libyaml-backed dumper when PyYAML was built with it
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# Connection settings shared by the environment variable tests
+STANDARD_ENV = MappingProxyType({
+    'DATABRICKS_SERVER_HOSTNAME': 'test.databricks.com',
+    'DATABRICKS_HTTP_PATH': '/sql/1.0/warehouses/test',
+    'DATABRICKS_ACCESS_TOKEN': 'test-token',
+    'DATABRICKS_CATALOG': 'test_catalog',
+    'DATABRICKS_SCHEMA': 'test_schema',
+})
+
+
+@pytest.fixture(params=['DEBUG', 'INFO', 'WARNING'])
+def databricks_env(request, monkeypatch):
+    """Set STANDARD_ENV plus a log level; the log level is returned."""
+    for key, value in STANDARD_ENV.items():
+        monkeypatch.setenv(key, value)
+    monkeypatch.setenv('DATABRICKS_MCP_LOG_LEVEL', request.param)
+    return request.param
+
+
 class TestConfigManager:
     """Test cases for ConfigManager class."""
     
@@ -25,15 +44,7 @@ class TestConfigManager:
         assert hasattr(config_manager, 'REQUIRED_FIELDS')
         assert hasattr(config_manager, 'DEFAULT_CONFIG_PATHS')
     
-    @patch.dict(os.environ, {
-        'DATABRICKS_SERVER_HOSTNAME': 'test.databricks.com',
-        'DATABRICKS_HTTP_PATH': '/sql/1.0/warehouses/test',
-        'DATABRICKS_ACCESS_TOKEN': 'test-token',
-        'DATABRICKS_CATALOG': 'test_catalog',
-        'DATABRICKS_SCHEMA': 'test_schema',
-        'DATABRICKS_MCP_LOG_LEVEL': 'DEBUG'
-    })
-    def test_load_config_from_environment_variables(self):
+    def test_load_config_from_environment_variables(self, databricks_env):
         """Test loading configuration from environment variables."""
         config_manager = ConfigManager()
         config = config_manager.load_config()
@@ -44,9 +55,9 @@ class TestConfigManager:
         assert config['databricks']['access_token'] == 'test-token'
         assert config['databricks']['catalog'] == 'test_catalog'
         assert config['databricks']['schema'] == 'test_schema'
-        assert config['log_level'] == 'DEBUG'
+        assert config['log_level'] == databricks_env
     
-    def test_load_config_from_file(self):
+    def test_load_config_from_file(self, tmp_path):
         """Test loading configuration from YAML file."""
         config_data = {
             'databricks': {
@@ -60,30 +71,42 @@ class TestConfigManager:
             'log_level': 'WARNING'
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(config_data, f)
-            config_file_path = f.name
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(yaml.dump(config_data, Dumper=YAML_DUMPER), encoding='utf-8')
+        
+        config_manager = ConfigManager()
+        config = config_manager.load_config(str(config_file))
         
-        try:
-            config_manager = ConfigManager()
-            config = config_manager.load_config(config_file_path)
-            
-            assert config['databricks']['server_hostname'] == 'file.databricks.com'
-            assert config['databricks']['http_path'] == '/sql/1.0/warehouses/file'
-            assert config['databricks']['access_token'] == 'file-token'
-            assert config['databricks']['catalog'] == 'file_catalog'
-            assert config['databricks']['schema'] == 'file_schema'
-            assert config['databricks']['timeout'] == 300
-            assert config['log_level'] == 'WARNING'
-        finally:
-            os.unlink(config_file_path)
+        assert config['databricks']['server_hostname'] == 'file.databricks.com'
+        assert config['databricks']['http_path'] == '/sql/1.0/warehouses/file'
+        assert config['databricks']['access_token'] == 'file-token'
+        assert config['databricks']['catalog'] == 'file_catalog'
+        assert config['databricks']['schema'] == 'file_schema'
+        assert config['databricks']['timeout'] == 300
+        assert config['log_level'] == 'WARNING'
     
-    @patch.dict(os.environ, {
-        'DATABRICKS_SERVER_HOSTNAME': 'env.databricks.com',
-        'DATABRICKS_ACCESS_TOKEN': 'env-token'
-    })
-    def test_environment_variables_override_file(self):
+    def test_load_config_from_string(self):
+        """Test loading configuration from YAML text without touching disk."""
+        config_data = {
+            'databricks': {
+                'server_hostname': 'string.databricks.com',
+                'http_path': '/sql/1.0/warehouses/string',
+                'access_token': 'string-token',
+                'timeout': 300
+            },
+            'log_level': 'WARNING'
+        }
+        
+        config_manager = ConfigManager()
+        config = config_manager.load_config_from_string(yaml.dump(config_data, Dumper=YAML_DUMPER))
+        
+        assert config == config_data
+    
+    def test_environment_variables_override_file(self, monkeypatch):
         """Test that environment variables take precedence over config file."""
+        monkeypatch.setenv('DATABRICKS_SERVER_HOSTNAME', 'env.databricks.com')
+        monkeypatch.setenv('DATABRICKS_ACCESS_TOKEN', 'env-token')
+        
         config_data = {
             'databricks': {
                 'server_hostname': 'file.databricks.com',
@@ -92,21 +115,14 @@ class TestConfigManager:
             }
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(config_data, f)
-            config_file_path = f.name
+        config_manager = ConfigManager()
+        config = config_manager.load_config_from_string(yaml.dump(config_data, Dumper=YAML_DUMPER))
         
-        try:
-            config_manager = ConfigManager()
-            config = config_manager.load_config(config_file_path)
-            
-            # Environment variables should override file values
-            assert config['databricks']['server_hostname'] == 'env.databricks.com'
-            assert config['databricks']['access_token'] == 'env-token'
-            # File values should remain for non-overridden fields
-            assert config['databricks']['http_path'] == '/sql/1.0/warehouses/file'
-        finally:
-            os.unlink(config_file_path)
+        # Environment variables should override file values
+        assert config['databricks']['server_hostname'] == 'env.databricks.com'
+        assert config['databricks']['access_token'] == 'env-token'
+        # File values should remain for non-overridden fields
+        assert config['databricks']['http_path'] == '/sql/1.0/warehouses/file'
     
     def test_load_config_file_not_found(self):
         """Test loading configuration when specified file doesn't exist."""
@@ -115,22 +131,25 @@ class TestConfigManager:
         with pytest.raises(ConfigurationError, match="Config file not found"):
             config_manager.load_config('/nonexistent/config.yaml')
     
-    def test_load_config_invalid_yaml(self):
+    def test_load_config_invalid_yaml(self, tmp_path):
         """Test loading configuration with invalid YAML."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            f.write("invalid: yaml: content: [")
-            config_file_path = f.name
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("invalid: yaml: content: [", encoding='utf-8')
+        
+        config_manager = ConfigManager()
+        with pytest.raises(ConfigurationError, match="Failed to load config file"):
+            config_manager.load_config(str(config_file))
+    
+    def test_load_config_from_string_invalid_yaml(self):
+        """Test loading configuration from invalid YAML text."""
+        config_manager = ConfigManager()
         
-        try:
-            config_manager = ConfigManager()
-            with pytest.raises(ConfigurationError, match="Failed to load config file"):
-                config_manager.load_config(config_file_path)
-        finally:
-            os.unlink(config_file_path)
+        with pytest.raises(ConfigurationError, match="Failed to parse config"):
+            config_manager.load_config_from_string("invalid: yaml: content: [")
     
-    @patch.dict(os.environ, {'DATABRICKS_TIMEOUT': 'invalid'})
-    def test_invalid_timeout_environment_variable(self):
+    def test_invalid_timeout_environment_variable(self, monkeypatch):
         """Test handling of invalid timeout value in environment variable."""
+        monkeypatch.setenv('DATABRICKS_TIMEOUT', 'invalid')
         config_manager = ConfigManager()
         
         with pytest.raises(ConfigurationError, match="Invalid timeout value"):
@@ -253,15 +272,7 @@ class TestConfigManager:
         databricks_config = config_manager.get_databricks_config(config)
         assert databricks_config == {}
     
-    @patch.dict(os.environ, {
-        'DATABRICKS_SERVER_HOSTNAME': 'test.databricks.com',
-        'DATABRICKS_HTTP_PATH': '/sql/1.0/warehouses/test',
-        'DATABRICKS_ACCESS_TOKEN': 'test-token',
-        'DATABRICKS_CATALOG': 'test_catalog',
-        'DATABRICKS_SCHEMA': 'test_schema',
-        'DATABRICKS_MCP_LOG_LEVEL': 'DEBUG'
-    })
-    def test_create_server_config(self):
+    def test_create_server_config(self, databricks_env):
         """Test creating ServerConfig object from loaded configuration."""
         config_manager = ConfigManager()
         server_config = config_manager.create_server_config()
@@ -273,7 +284,7 @@ class TestConfigManager:
         assert server_config.databricks.access_token == 'test-token'
         assert server_config.databricks.catalog == 'test_catalog'
         assert server_config.databricks.schema == 'test_schema'
-        assert server_config.log_level == 'DEBUG'
+        assert server_config.log_level == databricks_env
     
     def test_merge_config_simple(self):
         """Test merging simple configuration dictionaries."""
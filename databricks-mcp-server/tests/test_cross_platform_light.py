@@ -0,0 +1,34 @@
+"""
+Lightweight cross-platform checks for databricks-mcp-server.
+
+These tests only inspect the running interpreter, so unlike the rest of
+test_cross_platform.py they are not integration tests and run by default.
+"""
+
+import platform
+import sys
+
+
+class TestPlatformInfo:
+    """Test the platform and interpreter running the suite."""
+    
+    def test_platform_detection(self):
+        """Test that we can detect the current platform correctly."""
+        current_platform = platform.system()
+        assert current_platform in ["Windows", "Darwin", "Linux"], \
+            f"Unsupported platform: {current_platform}"
+        
+        print(f"Testing on platform: {current_platform}")
+        print(f"Platform details: {platform.platform()}")
+        print(f"Python version: {sys.version}")
+        print(f"Python executable: {sys.executable}")
+
+    def test_python_version_requirements(self):
+        """Test that current Python version meets requirements."""
+        current_version = sys.version_info
+        min_version = (3, 8)  # As specified in pyproject.toml
+        
+        assert current_version >= min_version, \
+            f"Python {current_version} is below minimum required {min_version}"
+        
+        print(f"Python version {current_version} meets requirements (>= {min_version})")
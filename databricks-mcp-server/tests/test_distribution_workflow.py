@@ -5,80 +5,91 @@ These tests validate the entire build and distribution process end-to-end.
 """
 
 import json
+import os
 import shutil
 import subprocess
 import sys
-import tempfile
 from pathlib import Path
-from unittest import mock
 
 import pytest
+import yaml
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# libyaml-backed loader when available
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Build output and caches left out of project copies
+PROJECT_COPY_IGNORE = shutil.ignore_patterns(
+    "dist", "build", "*.egg-info", "__pycache__", 
+    ".pytest_cache", ".coverage", "htmlcov"
+)
+
+
+def _link_or_copy(src, dst):
+    """Hard-link src to dst, falling back to a copy where links are unsupported."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _clone_project(dest):
+    """Clone the project tree into dest, hard-linking files instead of copying them.
+    
+    The builds only create new files (dist/, build/, venvs), so sharing inodes
+    with the source tree is safe; tests must not edit cloned files in place.
+    """
+    shutil.copytree(PROJECT_ROOT, dest, ignore=PROJECT_COPY_IGNORE, copy_function=_link_or_copy)
+    return dest
+
+
+@pytest.fixture(scope="session")
+def built_project(tmp_path_factory):
+    """Clone the project and run make build in it, once per session.
+    
+    Tests share the tree and its dist/, so they must not modify it; tests
+    that rebuild use their own temp_project instead.
+    """
+    project = _clone_project(tmp_path_factory.mktemp("built") / "project")
+    result = subprocess.run(
+        ["make", "build"],
+        cwd=project,
+        capture_output=True,
+        text=True,
+        timeout=300
+    )
+    assert result.returncode == 0, f"Build failed: {result.stderr}"
+    return project
 
 
 class TestDistributionWorkflow:
     """Test complete distribution workflow."""
     
     @pytest.fixture
-    def project_root(self):
-        """Get project root directory."""
-        return Path(__file__).parent.parent
-    
-    @pytest.fixture
-    def temp_project(self, project_root, tmp_path):
+    def temp_project(self, tmp_path):
         """Create temporary copy of project for testing."""
-        temp_project = tmp_path / "project"
-        shutil.copytree(
-            project_root, 
-            temp_project, 
-            ignore=shutil.ignore_patterns(
-                "dist", "build", "*.egg-info", "__pycache__", 
-                ".pytest_cache", ".coverage", "htmlcov"
-            )
-        )
-        return temp_project
+        return _clone_project(tmp_path / "project")
     
     @pytest.mark.integration
-    def test_complete_build_workflow(self, temp_project):
+    def test_complete_build_workflow(self, built_project):
         """Test complete build workflow using Makefile."""
-        # Run clean
-        result = subprocess.run(
-            ["make", "clean"],
-            cwd=temp_project,
-            capture_output=True,
-            text=True
-        )
-        assert result.returncode == 0, f"Clean failed: {result.stderr}"
-        
-        # Run build
-        result = subprocess.run(
-            ["make", "build"],
-            cwd=temp_project,
-            capture_output=True,
-            text=True
-        )
-        assert result.returncode == 0, f"Build failed: {result.stderr}"
+        # built_project ran make build, which runs make clean first
         
         # Verify artifacts
-        dist_dir = temp_project / "dist"
+        dist_dir = built_project / "dist"
         assert dist_dir.exists()
         assert len(list(dist_dir.glob("*.whl"))) == 1
         assert len(list(dist_dir.glob("*.tar.gz"))) == 1
     
     @pytest.mark.integration
-    def test_validation_workflow(self, temp_project):
+    def test_validation_workflow(self, built_project):
         """Test distribution validation workflow."""
-        # Build first
-        subprocess.run(
-            ["make", "build"],
-            cwd=temp_project,
-            check=True,
-            capture_output=True
-        )
-        
         # Run validation
         result = subprocess.run(
             [sys.executable, "scripts/validate_distribution.py", "--skip-uvx"],
-            cwd=temp_project,
+            cwd=built_project,
             capture_output=True,
             text=True
         )
@@ -106,50 +117,23 @@ class TestDistributionWorkflow:
         assert len(list(dist_dir.glob("*.tar.gz"))) == 1
     
     @pytest.mark.integration
-    def test_cross_platform_build(self, temp_project):
+    def test_cross_platform_build(self, built_project):
         """Test that build produces cross-platform compatible packages."""
-        # Build package
-        subprocess.run(
-            ["make", "build"],
-            cwd=temp_project,
-            check=True,
-            capture_output=True
-        )
-        
         # Check wheel is universal
-        wheel_files = list((temp_project / "dist").glob("*.whl"))
+        wheel_files = list((built_project / "dist").glob("*.whl"))
         assert len(wheel_files) == 1
         
         wheel_name = wheel_files[0].name
         assert "py3-none-any" in wheel_name, f"Wheel is not universal: {wheel_name}"
     
     @pytest.mark.integration
-    def test_dependency_validation(self, temp_project):
+    def test_dependency_validation(self, built_project, isolated_venv):
         """Test that all dependencies are correctly specified and installable."""
-        # Build package
-        subprocess.run(
-            ["make", "build"],
-            cwd=temp_project,
-            check=True,
-            capture_output=True
-        )
-        
-        # Create test environment
-        venv_dir = temp_project / "test_env"
-        subprocess.run(
-            [sys.executable, "-m", "venv", str(venv_dir)],
-            check=True,
-            capture_output=True
-        )
-        
-        # Get python executable
-        if sys.platform == "win32":
-            python_exe = venv_dir / "Scripts" / "python.exe"
-        else:
-            python_exe = venv_dir / "bin" / "python"
+        # Test environment cloned from the session's base venv
+        python_exe = isolated_venv['python']
         
         # Install package
-        wheel_files = list((temp_project / "dist").glob("*.whl"))
+        wheel_files = list((built_project / "dist").glob("*.whl"))
         wheel_file = wheel_files[0]
         
         result = subprocess.run(
@@ -167,34 +151,28 @@ class TestDistributionWorkflow:
         )
         assert result.returncode == 0, f"Dependency check failed: {result.stderr}"
     
-    def test_version_consistency(self, temp_project):
+    @pytest.mark.integration
+    def test_version_consistency(self, built_project):
         """Test version consistency across all files."""
-        # Get version from pyproject.toml
-        pyproject_path = temp_project / "pyproject.toml"
-        content = pyproject_path.read_text()
-        
-        import re
-        version_match = re.search(r'version = "([^"]+)"', content)
-        assert version_match, "Version not found in pyproject.toml"
-        version = version_match.group(1)
+        if sys.version_info >= (3, 11):
+            import tomllib
+        else:
+            tomllib = pytest.importorskip("tomli")
         
-        # Build package
-        subprocess.run(
-            ["make", "build"],
-            cwd=temp_project,
-            check=True,
-            capture_output=True
-        )
+        # Get version from pyproject.toml
+        pyproject_path = built_project / "pyproject.toml"
+        with pyproject_path.open("rb") as f:
+            version = tomllib.load(f)["project"]["version"]
         
         # Check version in wheel filename
-        wheel_files = list((temp_project / "dist").glob("*.whl"))
+        wheel_files = list((built_project / "dist").glob("*.whl"))
         assert len(wheel_files) == 1
         
         wheel_name = wheel_files[0].name
         assert version in wheel_name, f"Version {version} not in wheel name: {wheel_name}"
         
         # Check version in source distribution
-        tar_files = list((temp_project / "dist").glob("*.tar.gz"))
+        tar_files = list((built_project / "dist").glob("*.tar.gz"))
         assert len(tar_files) == 1
         
         tar_name = tar_files[0].name
@@ -204,29 +182,30 @@ class TestDistributionWorkflow:
 class TestAutomatedWorkflows:
     """Test automated workflow components."""
     
-    def test_github_actions_syntax(self, project_root):
+    def test_github_actions_syntax(self):
         """Test that GitHub Actions workflows have valid syntax."""
-        workflows_dir = project_root / ".github" / "workflows"
+        workflows_dir = PROJECT_ROOT / ".github" / "workflows"
         
         for workflow_file in workflows_dir.glob("*.yml"):
-            content = workflow_file.read_text()
+            workflow = yaml.load(workflow_file.read_text(), Loader=YAML_LOADER)
             
-            # Basic YAML syntax checks
-            assert "name:" in content
-            assert "on:" in content
-            assert "jobs:" in content
+            # Basic structure checks; PyYAML reads the bare "on" key as True
+            assert "name" in workflow
+            assert "on" in workflow or True in workflow
+            assert "jobs" in workflow
+            jobs = workflow["jobs"]
             
             # Check for required workflow elements
             if "build" in workflow_file.name:
-                assert "strategy:" in content
-                assert "matrix:" in content
+                assert any("matrix" in job.get("strategy", {}) for job in jobs.values())
             elif "release" in workflow_file.name:
-                assert "tags:" in content
-                assert "TestPyPI" in content or "testpypi" in content
+                triggers = workflow.get("on", workflow.get(True))
+                assert "tags" in triggers["push"]
+                assert any("testpypi" in job_id for job_id in jobs)
     
-    def test_makefile_targets(self, project_root):
+    def test_makefile_targets(self):
         """Test that all Makefile targets are properly defined."""
-        makefile_path = project_root / "Makefile"
+        makefile_path = PROJECT_ROOT / "Makefile"
         content = makefile_path.read_text()
         
         # Check that targets have proper dependencies
@@ -239,9 +218,9 @@ class TestAutomatedWorkflows:
         assert "help:" in content
         assert "@echo" in content
     
-    def test_script_executability(self, project_root):
+    def test_script_executability(self):
         """Test that all scripts are executable and have proper shebangs."""
-        scripts_dir = project_root / "scripts"
+        scripts_dir = PROJECT_ROOT / "scripts"
         
         for script_file in scripts_dir.glob("*.py"):
             content = script_file.read_text()
@@ -260,32 +239,9 @@ class TestAutomatedWorkflows:
 class TestDistributionValidation:
     """Test distribution validation functionality."""
     
-    @pytest.fixture
-    def project_root(self):
-        """Get project root directory."""
-        return Path(__file__).parent.parent
-    
-    def test_validation_script_functionality(self, project_root, tmp_path):
+    @pytest.mark.integration
+    def test_validation_script_functionality(self, built_project, tmp_path):
         """Test that validation script works correctly."""
-        # Create temporary project
-        temp_project = tmp_path / "project"
-        shutil.copytree(
-            project_root, 
-            temp_project, 
-            ignore=shutil.ignore_patterns(
-                "dist", "build", "*.egg-info", "__pycache__", 
-                ".pytest_cache", ".coverage", "htmlcov"
-            )
-        )
-        
-        # Build package
-        subprocess.run(
-            ["make", "build"],
-            cwd=temp_project,
-            check=True,
-            capture_output=True
-        )
-        
         # Run validation with report generation
         report_file = tmp_path / "validation_report.json"
         result = subprocess.run(
@@ -295,7 +251,7 @@ class TestDistributionValidation:
                 "--skip-uvx",
                 "--report", str(report_file)
             ],
-            cwd=temp_project,
+            cwd=built_project,
             capture_output=True,
             text=True
         )
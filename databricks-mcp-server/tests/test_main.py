@@ -75,6 +75,13 @@ class TestParseArguments:
             with pytest.raises(SystemExit) as exc_info:
                 parse_arguments()
             assert exc_info.value.code == 0
+    
+    def test_parse_arguments_explicit_argv(self):
+        """Test that an explicit argv is parsed instead of sys.argv."""
+        with patch('sys.argv', ['databricks-mcp-server', '--log-level', 'ERROR']):
+            args = parse_arguments(['--config', '/explicit/config.yaml'])
+            assert args.config == '/explicit/config.yaml'
+            assert args.log_level == 'INFO'
 
 
 class TestSetupLogging:
@@ -4,8 +4,12 @@ Unit tests for the Databricks MCP Server core functionality.
 Tests the server initialization, lifecycle management, and MCP tool functionality.
 """
 
+import asyncio
 import json
+import threading
+import time
 import pytest
+import requests
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
 
 from databricks_mcp_server.server import (
@@ -569,6 +573,242 @@ class TestClusterManager:
         assert result_dict['cluster_id'] == 'cluster-1'
         assert result_dict['cluster_info']['state'] == 'RUNNING'
 
+    @pytest.mark.asyncio
+    async def test_list_jobs_success(self):
+        """Test successful job listing."""
+        mock_connection_manager = Mock()
+        
+        payload = {
+            'jobs': [
+                {
+                    'job_id': 42,
+                    'creator_user_name': 'test@example.com',
+                    'created_time': 1700000000000,
+                    'settings': {'name': 'Nightly ETL', 'max_concurrent_runs': 1}
+                }
+            ]
+        }
+        mock_session = Mock()
+        mock_response = Mock()
+        mock_response.ok = True
+        mock_response.status_code = 200
+        mock_response.content = json.dumps(payload).encode()
+        mock_response.json.return_value = payload
+        mock_session.get.return_value = mock_response
+        mock_connection_manager.get_rest_client.return_value = (mock_session, 'https://test.databricks.com')
+        
+        manager = ClusterManager(mock_connection_manager)
+        
+        result = await manager.list_jobs()
+        result_dict = json.loads(result)
+        
+        assert result_dict['success'] is True
+        assert result_dict['count'] == 1
+        assert result_dict['jobs'][0]['job_id'] == 42
+        assert result_dict['jobs'][0]['job_name'] == 'Nightly ETL'
+        assert result_dict['jobs'][0]['job_type'] is None
+        assert result_dict['jobs'][0]['max_concurrent_runs'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_get_job_run_status_success(self):
+        """Test successful job run status retrieval."""
+        mock_connection_manager = Mock()
+        
+        payload = {
+            'job_id': 42,
+            'run_name': 'Nightly ETL',
+            'state': {'life_cycle_state': 'TERMINATED', 'result_state': 'SUCCESS'},
+            'execution_duration': 1200
+        }
+        mock_session = Mock()
+        mock_response = Mock()
+        mock_response.ok = True
+        mock_response.status_code = 200
+        mock_response.content = json.dumps(payload).encode()
+        mock_response.json.return_value = payload
+        mock_session.get.return_value = mock_response
+        mock_connection_manager.get_rest_client.return_value = (mock_session, 'https://test.databricks.com')
+        
+        manager = ClusterManager(mock_connection_manager)
+        
+        result = await manager.get_job_run_status('7')
+        result_dict = json.loads(result)
+        
+        assert result_dict['success'] is True
+        assert result_dict['run_id'] == '7'
+        assert result_dict['run_info']['life_cycle_state'] == 'TERMINATED'
+        assert result_dict['run_info']['result_state'] == 'SUCCESS'
+        assert result_dict['run_info']['execution_duration'] == 1200
+
+    @pytest.mark.asyncio
+    async def test_list_jobs_keeps_event_loop_responsive(self):
+        """Test that REST client setup and the request run off the event loop."""
+        mock_connection_manager = Mock()
+        released = threading.Event()
+
+        mock_response = Mock()
+        mock_response.ok = True
+        mock_response.status_code = 200
+        mock_response.content = b'{"jobs": []}'
+        mock_response.json.return_value = {'jobs': []}
+
+        def blocking_client():
+            assert released.wait(5), "event loop was blocked during client setup"
+            return mock_session, 'https://test.databricks.com'
+
+        def blocking_get(url):
+            assert released.wait(5), "event loop was blocked during the request"
+            return mock_response
+
+        mock_session = Mock()
+        mock_session.get.side_effect = blocking_get
+        mock_connection_manager.get_rest_client.side_effect = blocking_client
+
+        async def release_from_loop():
+            # Only runs if list_jobs yields the loop while the mocks block
+            await asyncio.sleep(0.01)
+            released.set()
+
+        manager = ClusterManager(mock_connection_manager)
+
+        result, _ = await asyncio.gather(manager.list_jobs(), release_from_loop())
+        result_dict = json.loads(result)
+
+        assert result_dict['success'] is True
+        assert result_dict['count'] == 0
+
+    @pytest.mark.asyncio
+    async def test_get_job_run_statuses_mixed(self):
+        """Test batch run status retrieval with one failing run."""
+        mock_connection_manager = Mock()
+
+        payload = {'job_id': 42, 'state': {'life_cycle_state': 'RUNNING'}}
+        ok_response = Mock()
+        ok_response.ok = True
+        ok_response.status_code = 200
+        ok_response.content = json.dumps(payload).encode()
+        ok_response.json.return_value = payload
+        missing_response = Mock()
+        missing_response.ok = False
+        missing_response.status_code = 404
+        missing_response.text = 'Run 8 does not exist'
+
+        def fake_get(url, params):
+            return ok_response if params['run_id'] == '7' else missing_response
+
+        mock_session = Mock()
+        mock_session.get.side_effect = fake_get
+        mock_connection_manager.get_rest_client.return_value = (mock_session, 'https://test.databricks.com')
+
+        manager = ClusterManager(mock_connection_manager)
+
+        result = await manager.get_job_run_statuses(['7', '8'])
+        result_dict = json.loads(result)
+
+        assert result_dict['success'] is False
+        assert result_dict['count'] == 2
+        assert result_dict['runs'][0]['run_id'] == '7'
+        assert result_dict['runs'][0]['run_info']['life_cycle_state'] == 'RUNNING'
+        assert result_dict['runs'][1]['run_id'] == '8'
+        assert result_dict['runs'][1]['error']['error_code'] == 'CONN_001'
+        mock_connection_manager.get_rest_client.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_job_run_statuses_transport_error(self):
+        """Test that a connection failure on one run does not fail the batch."""
+        mock_connection_manager = Mock()
+
+        payload = {'job_id': 42, 'state': {'life_cycle_state': 'RUNNING'}}
+        ok_response = Mock()
+        ok_response.ok = True
+        ok_response.status_code = 200
+        ok_response.content = json.dumps(payload).encode()
+        ok_response.json.return_value = payload
+
+        def fake_get(url, params):
+            if params['run_id'] == '8':
+                raise requests.ConnectionError('Connection reset by peer')
+            return ok_response
+
+        mock_session = Mock()
+        mock_session.get.side_effect = fake_get
+        mock_connection_manager.get_rest_client.return_value = (mock_session, 'https://test.databricks.com')
+
+        manager = ClusterManager(mock_connection_manager)
+
+        result = await manager.get_job_run_statuses(['7', '8', '9'])
+        result_dict = json.loads(result)
+
+        assert result_dict['success'] is False
+        assert result_dict['count'] == 3
+        assert [run['success'] for run in result_dict['runs']] == [True, False, True]
+        assert result_dict['runs'][1]['run_id'] == '8'
+        assert result_dict['runs'][1]['error']['error_code'] == 'CONN_001'
+        assert result_dict['runs'][2]['run_info']['life_cycle_state'] == 'RUNNING'
+
+    @pytest.mark.asyncio
+    async def test_get_job_run_statuses_bounds_concurrency(self):
+        """Test that batch run status requests are limited in flight."""
+        mock_connection_manager = Mock()
+
+        payload = {'job_id': 42, 'state': {'life_cycle_state': 'RUNNING'}}
+        ok_response = Mock()
+        ok_response.ok = True
+        ok_response.status_code = 200
+        ok_response.content = json.dumps(payload).encode()
+        ok_response.json.return_value = payload
+
+        lock = threading.Lock()
+        in_flight = {'current': 0, 'peak': 0}
+
+        def counting_get(url, params):
+            with lock:
+                in_flight['current'] += 1
+                in_flight['peak'] = max(in_flight['peak'], in_flight['current'])
+            time.sleep(0.01)
+            with lock:
+                in_flight['current'] -= 1
+            return ok_response
+
+        mock_session = Mock()
+        mock_session.get.side_effect = counting_get
+        mock_connection_manager.get_rest_client.return_value = (mock_session, 'https://test.databricks.com')
+
+        manager = ClusterManager(mock_connection_manager)
+
+        # A limit below the default thread pool size, so the semaphore is what bounds it
+        run_ids = [str(run_id) for run_id in range(12)]
+        with patch('databricks_mcp_server.server._MAX_CONCURRENT_RUN_REQUESTS', 2):
+            result = await manager.get_job_run_statuses(run_ids)
+        result_dict = json.loads(result)
+
+        assert result_dict['success'] is True
+        assert result_dict['count'] == len(run_ids)
+        assert in_flight['peak'] <= 2
+
+    @pytest.mark.asyncio
+    async def test_list_jobs_http_error(self):
+        """Test job listing with a non-2xx REST response."""
+        mock_connection_manager = Mock()
+
+        mock_session = Mock()
+        mock_response = Mock()
+        mock_response.ok = False
+        mock_response.status_code = 403
+        mock_response.text = 'User does not have permission'
+        mock_session.get.return_value = mock_response
+        mock_connection_manager.get_rest_client.return_value = (mock_session, 'https://test.databricks.com')
+
+        manager = ClusterManager(mock_connection_manager)
+
+        result = await manager.list_jobs()
+        result_dict = json.loads(result)
+
+        assert result_dict['error'] is True
+        assert result_dict['error_code'] == 'AUTH_002'
+        assert '403' in result_dict['message']
+        mock_response.raise_for_status.assert_not_called()
+
 
 class TestDatabricksMCPServer:
     """Test cases for DatabricksMCPServer class."""